@@ -1,11 +1,23 @@
 from flask import Flask
 from flask_mail import Mail
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import firebase_admin
 from firebase_admin import credentials
 from app.config import Config
-import logging
+from app.logging_config import configure_logging
+from app.profiling import TracedClient, init_profiling
 from googlemaps import Client
+from app.services.admission import AdmissionController
+from app.services.capture import RecordingClient, TrafficRecorder
+from app.services.itinerary_store import ItineraryStore
+from app.services.llm import create_llm
+from app.services.photo_cache import PhotoCache
+from app.services.place_catalog import PlaceCatalog
+from app.services.place_resolver import PlaceResolver
+from app.services.renderer import GuideRenderer
+from app.services.route_cache import RouteCache
+from app.services.shared_cache import CachedClient, create_cache_backend
 
 mail = Mail()
 
@@ -13,13 +25,17 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[logging.StreamHandler()]
+    # Must run before app.logger is first used so Flask skips its default handler
+    app.log_handler = configure_logging(
+        level=app.config['LOG_LEVEL'],
+        fmt=app.config['LOG_FORMAT'],
+        sample_rate=app.config['LOG_SAMPLE_RATE'],
+        queue_size=app.config['LOG_QUEUE_SIZE']
     )
     app.logger.info("Starting Flask application")
 
+    init_profiling(app)
+
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
     if not firebase_admin._apps:
@@ -28,16 +44,78 @@ def create_app(config_class=Config):
             firebase_admin.initialize_app(cred)
             app.logger.info("Firebase initialized successfully")
         except Exception as e:
-            app.logger.error(f"Failed to initialize Firebase: {str(e)}")
+            app.logger.error("Failed to initialize Firebase: %s", e)
 
     mail.init_app(app)
 
+    if app.config['TRUSTED_PROXY_HOPS'] > 0:
+        # Only trust forwarding headers set by our own proxies
+        hops = app.config['TRUSTED_PROXY_HOPS']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+    app.admission = {
+        pool: AdmissionController(
+            pool,
+            rate=app.config[f'{prefix}_RATE_LIMIT'],
+            burst=app.config[f'{prefix}_BURST'],
+            max_concurrent=app.config[f'{prefix}_MAX_CONCURRENCY'],
+            max_queue=app.config[f'{prefix}_MAX_QUEUE'],
+            queue_timeout=app.config[f'{prefix}_QUEUE_TIMEOUT']
+        )
+        for pool, prefix in (('generate', 'GENERATE'), ('read', 'READ'))
+    }
+
+    app.traffic_recorder = TrafficRecorder(
+        app.config['CAPTURE_FILE'],
+        secret=app.config.get('CAPTURE_SECRET')
+    ) if app.config.get('CAPTURE_FILE') else None
+
     with app.app_context():
-        app.gmaps = Client(key=app.config.get('GOOGLE_MAPS_API_KEY'))
+        gmaps = app.config.get('GMAPS_CLIENT') or Client(key=app.config.get('GOOGLE_MAPS_API_KEY'))
+        llm = app.config.get('LLM_CLIENT') or create_llm(app.config)
+        if app.traffic_recorder is not None and app.config.get('CAPTURE_UPSTREAM'):
+            gmaps = RecordingClient(gmaps, 'gmaps', app.traffic_recorder)
+            llm = RecordingClient(llm, 'llm', app.traffic_recorder)
+        app.gmaps = TracedClient(gmaps, 'gmaps')
+        app.photo_cache = PhotoCache(
+            app.gmaps,
+            app.config['PHOTO_CACHE_DIR'],
+            widths=app.config['PHOTO_WIDTHS']
+        )
+        app.guide_renderer = GuideRenderer(cache_size=app.config['RENDER_CACHE_SIZE'])
+        app.llm = TracedClient(llm, 'llm')
+        # Upstream responses shared by all workers (see app.services.shared_cache)
+        app.shared_cache = create_cache_backend(app.config)
+        app.cached_gmaps = CachedClient(app.gmaps, 'gmaps', app.shared_cache, {
+            'geocode': app.config['GEOCODE_CACHE_TTL'],
+            'place': app.config['PLACE_DETAILS_CACHE_TTL'],
+            'places_nearby': app.config['NEARBY_CACHE_TTL'],
+            'find_place': app.config['PLACE_RESOLVE_CACHE_TTL']
+        })
+        app.cached_llm = CachedClient(app.llm, 'llm', app.shared_cache, {'complete': app.config['LLM_CACHE_TTL']})
+        app.itinerary_store = ItineraryStore(app.config['ITINERARY_STORE_PATH'])
+        app.place_catalog = PlaceCatalog(
+            app.config['PLACE_CATALOG_PATH'],
+            max_age=app.config['PLACE_CATALOG_MAX_AGE']
+        )
+        app.place_resolver = PlaceResolver(
+            app.cached_gmaps,
+            cache_size=app.config['PLACE_RESOLVE_CACHE_SIZE'],
+            cache_ttl=app.config['PLACE_RESOLVE_CACHE_TTL'],
+            max_workers=app.config['PLACE_RESOLVE_MAX_WORKERS']
+        )
+        app.route_cache = RouteCache(
+            bucket_seconds=app.config['ROUTE_TIME_BUCKET_SECONDS'],
+            static_ttl=app.config['ROUTE_STATIC_TTL'],
+            stale_ttl=app.config['ROUTE_STALE_TTL'],
+            cache=app.shared_cache
+        )
 
     from app.routes.main_routes import main_bp
     from app.routes.api_routes import api_bp
+    from app.routes.admin_routes import admin_bp
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
 
     return app
\ No newline at end of file
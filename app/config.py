@@ -12,6 +12,109 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+
+    # Logging: records go through a queue to a background writer. Verbose
+    # per-request logs are kept for LOG_SAMPLE_RATE of requests.
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # 'json' or 'text'
+    LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 0.01))
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+
+    # Per-request profiling (see app.profiling); admin endpoints and X-Profile
+    # headers are disabled unless ADMIN_TOKEN is set. X-Profile tokens are
+    # signed with PROFILE_SECRET, or ADMIN_TOKEN when it is unset, never with
+    # SECRET_KEY
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+    PROFILE_SECRET = os.environ.get('PROFILE_SECRET')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_STACKS = os.environ.get('PROFILE_STACKS', 'False') == 'True'
+    PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', 0.005))
+    PROFILE_RING_SIZE = int(os.environ.get('PROFILE_RING_SIZE', 100))
+    PROFILE_TOKEN_MAX_AGE = int(os.environ.get('PROFILE_TOKEN_MAX_AGE', 3600))
+
+    # Traffic capture for the replay harness (see app.services.capture)
+    CAPTURE_FILE = os.environ.get('CAPTURE_FILE')
+    CAPTURE_UPSTREAM = os.environ.get('CAPTURE_UPSTREAM', 'False') == 'True'
+    # HMAC key for client/email pseudonyms; random per capture file when unset
+    CAPTURE_SECRET = os.environ.get('CAPTURE_SECRET')
+
+    # Upstream client overrides, used by the replay harness to inject fakes
+    GMAPS_CLIENT = None
+    LLM_CLIENT = None
+
+    # Itinerary generation
+    LLM_BACKEND = os.environ.get('LLM_BACKEND', 'deepseek')  # 'deepseek' or 'fake'
+    DEEPSEEK_API_KEY = os.environ.get('DEEPSEEK_API_KEY')
+    DEEPSEEK_BASE_URL = os.environ.get('DEEPSEEK_BASE_URL', 'https://api.deepseek.com')
+    DEEPSEEK_MODEL = os.environ.get('DEEPSEEK_MODEL', 'deepseek-chat')
+    # 'single' asks for the whole itinerary in one completion; 'parallel' builds a
+    # skeleton then generates days concurrently; 'auto' uses parallel from
+    # ITINERARY_PARALLEL_MIN_DAYS days upwards. Trips longer than
+    # ITINERARY_PARALLEL_MAX_DAYS always use a single completion, since the
+    # parallel path costs days + 2 LLM calls.
+    ITINERARY_GENERATION_MODE = os.environ.get('ITINERARY_GENERATION_MODE', 'single')
+    ITINERARY_PARALLEL_MIN_DAYS = int(os.environ.get('ITINERARY_PARALLEL_MIN_DAYS', 5))
+    ITINERARY_PARALLEL_MAX_DAYS = int(os.environ.get('ITINERARY_PARALLEL_MAX_DAYS', 14))
+    ITINERARY_MAX_PARALLEL = int(os.environ.get('ITINERARY_MAX_PARALLEL', 4))
+    PLACE_RESOLVE_CACHE_SIZE = int(os.environ.get('PLACE_RESOLVE_CACHE_SIZE', 5000))
+    PLACE_RESOLVE_CACHE_TTL = int(os.environ.get('PLACE_RESOLVE_CACHE_TTL', 7 * 24 * 3600))
+    PLACE_RESOLVE_MAX_WORKERS = int(os.environ.get('PLACE_RESOLVE_MAX_WORKERS', 8))
+    # Concurrent nearby searches and detail lookups per /search_places request
+    PLACES_SEARCH_MAX_WORKERS = int(os.environ.get('PLACES_SEARCH_MAX_WORKERS', 8))
+    ITINERARY_STORE_PATH = os.environ.get('ITINERARY_STORE_PATH', 'cache/itineraries.sqlite3')
+
+    # Local place catalog for popular cities (see app.services.place_catalog)
+    PLACE_CATALOG_PATH = os.environ.get('PLACE_CATALOG_PATH', 'cache/places.sqlite3')
+    PLACE_CATALOG_MAX_AGE = int(os.environ.get('PLACE_CATALOG_MAX_AGE', 30 * 24 * 3600))
+
+    # Place photo proxy
+    PHOTO_CACHE_DIR = os.environ.get('PHOTO_CACHE_DIR', 'cache/photos')
+    PHOTO_WIDTHS = [int(w) for w in os.environ.get('PHOTO_WIDTHS', '200,400,800').split(',')]
+    PHOTO_CACHE_MAX_AGE = int(os.environ.get('PHOTO_CACHE_MAX_AGE', 31536000))
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'False') == 'True'
+
+    # Cache for Google Maps and LLM responses, shared by all workers:
+    # 'sqlite' (one host, CACHE_PATH), 'redis' (CACHE_REDIS_URL; 'memory://'
+    # is an in-process stand-in) or 'memory' (per worker)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite')
+    CACHE_PATH = os.environ.get('CACHE_PATH', 'cache/shared.sqlite3')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_KEY_PREFIX = os.environ.get('CACHE_KEY_PREFIX', 'travelguide:')
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 100000))
+    CACHE_MAX_VALUE_BYTES = int(os.environ.get('CACHE_MAX_VALUE_BYTES', 1 << 20))
+    GEOCODE_CACHE_TTL = int(os.environ.get('GEOCODE_CACHE_TTL', 30 * 24 * 3600))
+    PLACE_DETAILS_CACHE_TTL = int(os.environ.get('PLACE_DETAILS_CACHE_TTL', 24 * 3600))
+    NEARBY_CACHE_TTL = int(os.environ.get('NEARBY_CACHE_TTL', 24 * 3600))
+    LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', 7 * 24 * 3600))
+
+    # Directions cache. Driving/transit routes stay fresh until the end of their
+    # departure-time bucket; walking/bicycling routes for ROUTE_STATIC_TTL.
+    # ROUTE_STALE_TTL > 0 serves expired routes that long while refreshing them.
+    # Routes are stored in the shared cache, so its CACHE_* limits apply.
+    ROUTE_TIME_BUCKET_SECONDS = int(os.environ.get('ROUTE_TIME_BUCKET_SECONDS', 900))
+    ROUTE_STATIC_TTL = int(os.environ.get('ROUTE_STATIC_TTL', 7 * 24 * 3600))
+    ROUTE_STALE_TTL = int(os.environ.get('ROUTE_STALE_TTL', 0))
+
+    # Rendered guide emails, cached by itinerary hash
+    RENDER_CACHE_SIZE = int(os.environ.get('RENDER_CACHE_SIZE', 256))
+
+    # Admission control. Limits apply per worker process; gunicorn.conf.py
+    # gives each worker GENERATE_MAX_CONCURRENCY + READ_MAX_CONCURRENCY threads
+    # so the read endpoints always have capacity left.
+    # Reverse proxies in front of the app (Heroku's router is one). Clients are
+    # identified by the X-Forwarded-For entry this many hops from the end;
+    # set to 0 when the app is reached directly.
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 1))
+    GENERATE_RATE_LIMIT = float(os.environ.get('GENERATE_RATE_LIMIT', 0.05))  # requests/second per client
+    GENERATE_BURST = int(os.environ.get('GENERATE_BURST', 3))
+    GENERATE_MAX_CONCURRENCY = int(os.environ.get('GENERATE_MAX_CONCURRENCY', 4))
+    GENERATE_MAX_QUEUE = int(os.environ.get('GENERATE_MAX_QUEUE', 8))
+    GENERATE_QUEUE_TIMEOUT = float(os.environ.get('GENERATE_QUEUE_TIMEOUT', 10))
+    READ_RATE_LIMIT = float(os.environ.get('READ_RATE_LIMIT', 10))
+    READ_BURST = int(os.environ.get('READ_BURST', 40))
+    READ_MAX_CONCURRENCY = int(os.environ.get('READ_MAX_CONCURRENCY', 16))
+    READ_MAX_QUEUE = int(os.environ.get('READ_MAX_QUEUE', 32))
+    READ_QUEUE_TIMEOUT = float(os.environ.get('READ_QUEUE_TIMEOUT', 2))
     
     # Firebase Configuration
     FIREBASE_API_KEY = os.environ.get('FIREBASE_API_KEY')
@@ -0,0 +1,136 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context
+
+# Pass as `extra=SAMPLED` on verbose per-request log calls
+SAMPLED = {'sampled': True}
+
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'sampled'}
+
+_listener = None
+_handler = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any `extra` fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps records marked `sampled` for only a fraction of requests.
+
+    The decision is made once per request, so a sampled request keeps all
+    of its verbose logs. Unmarked records always pass.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if not getattr(record, 'sampled', False) or self.rate >= 1.0:
+            return True
+        if has_request_context():
+            if '_log_sampled' not in g:
+                g._log_sampled = random.random() < self.rate
+            return g._log_sampled
+        return random.random() < self.rate
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    QueueHandler that defers all formatting to the listener thread.
+
+    The stock QueueHandler formats the message in the caller's thread;
+    here the record is enqueued as-is, so the request thread only pays for
+    creating the record and a non-blocking put. When the queue is full the
+    record is dropped and counted rather than blocking the request.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+        self.filtered = 0
+        self.handle_ns = 0
+
+    def handle(self, record):
+        started = time.perf_counter_ns()
+        emitted = super().handle(record)
+        self.handle_ns += time.perf_counter_ns() - started
+        if not emitted:
+            self.filtered += 1
+        return emitted
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self):
+        handled = self.enqueued + self.dropped + self.filtered
+        return {
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'sampled_out': self.filtered,
+            'queue_size': self.queue.qsize(),
+            'avg_handle_us': round(self.handle_ns / handled / 1000, 2) if handled else 0.0
+        }
+
+
+def configure_logging(level='INFO', fmt='json', sample_rate=1.0, queue_size=10000):
+    """
+    Route all logging through a bounded queue drained by a background writer.
+
+    Safe to call more than once (e.g. one create_app per test); the
+    listener is only started the first time.
+    """
+    global _listener, _handler
+    with _lock:
+        if _handler is None:
+            log_queue = queue.Queue(maxsize=queue_size)
+            stream_handler = logging.StreamHandler(sys.stderr)
+            _handler = BackgroundQueueHandler(log_queue)
+            _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+            _listener.start()
+            atexit.register(_listener.stop)
+
+        stream_handler = _listener.handlers[0]
+        if fmt == 'json':
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        _handler.filters = [SamplingFilter(sample_rate)]
+
+        root = logging.getLogger()
+        root.handlers = [_handler]
+        root.setLevel(level)
+        return _handler
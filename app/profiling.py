@@ -0,0 +1,243 @@
+"""
+On-demand per-request profiling.
+
+A request is profiled when it carries a valid signed `X-Profile` header or
+is picked by the runtime PROFILE_SAMPLE_RATE. Profiled requests record a
+span tree covering upstream calls and the major local stages, optionally
+with sampled Python stacks in collapsed (flamegraph) format. Finished
+traces are kept in a bounded in-memory ring read from the admin endpoints.
+
+When a request is not profiled the only cost is a context variable lookup
+per span.
+"""
+import collections
+import contextvars
+import functools
+import itertools
+import random
+import sys
+import threading
+import time
+
+from flask import current_app, g, request
+from itsdangerous import BadSignature, TimestampSigner
+
+_current_span = contextvars.ContextVar('profiling_span', default=None)
+_trace_ids = itertools.count(1)
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'start', 'end', 'children')
+
+    def __init__(self, name, attrs=None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+
+    def to_dict(self, origin=None):
+        origin = self.start if origin is None else origin
+        end = self.end if self.end is not None else time.perf_counter()
+        entry = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round((end - self.start) * 1000, 3)
+        }
+        if self.attrs:
+            entry['attrs'] = self.attrs
+        if self.children:
+            entry['children'] = [child.to_dict(origin) for child in self.children]
+        return entry
+
+
+class span:
+    """Context manager recording a child span when the current request is profiled"""
+
+    __slots__ = ('name', 'attrs', '_span', '_token')
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self._span = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        self._span = Span(self.name, self.attrs)
+        parent.children.append(self._span)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._span is not None:
+            self._span.end = time.perf_counter()
+            if exc_type is not None:
+                self._span.attrs['error'] = exc_type.__name__
+            _current_span.reset(self._token)
+        return False
+
+
+def propagate(fn):
+    """Bind `fn` to the current context so spans opened in executor threads join the trace"""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+class TracedClient:
+    """Proxy recording a span around every method call on an upstream client"""
+
+    def __init__(self, client, label):
+        self._client = client
+        self._label = label
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        label = f"{self._label}.{name}"
+
+        def call(*args, **kwargs):
+            if _current_span.get() is None:
+                return attr(*args, **kwargs)
+            with span(label):
+                return attr(*args, **kwargs)
+
+        self.__dict__[name] = call
+        return call
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return [f"{stack} {count}" for stack, count in self.counts.most_common()]
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+
+class TraceRing:
+    """Bounded, thread-safe store of the most recent traces"""
+
+    def __init__(self, maxlen=100):
+        self._traces = collections.deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def list(self):
+        with self._lock:
+            return list(self._traces)
+
+    def get(self, trace_id):
+        with self._lock:
+            return next((t for t in self._traces if t['id'] == trace_id), None)
+
+
+def _signer(app):
+    # A dedicated secret: SECRET_KEY ships with a public default
+    secret = app.config.get('PROFILE_SECRET') or app.config.get('ADMIN_TOKEN')
+    if not secret:
+        raise RuntimeError("Profiling tokens need ADMIN_TOKEN or PROFILE_SECRET")
+    return TimestampSigner(secret, salt='request-profiling')
+
+
+def make_profile_token(app, stacks=False):
+    """Signed value for the X-Profile header; 'stacks' also enables stack sampling"""
+    return _signer(app).sign('stacks' if stacks else 'spans').decode()
+
+
+def _requested_mode(app):
+    token = request.headers.get('X-Profile')
+    # Header profiling is an admin feature; ignore the header when admin is off
+    if token and app.config.get('ADMIN_TOKEN'):
+        try:
+            return _signer(app).unsign(token, max_age=app.config['PROFILE_TOKEN_MAX_AGE']).decode()
+        except BadSignature:
+            return None
+    rate = app.profile_settings['sample_rate']
+    if rate and random.random() < rate:
+        return 'stacks' if app.profile_settings['stacks'] else 'spans'
+    return None
+
+
+def _start_trace():
+    app = current_app._get_current_object()
+    mode = _requested_mode(app)
+    if mode is None:
+        return
+    root = Span(f"{request.method} {request.path}")
+    g._profile = {
+        'root': root,
+        'token': _current_span.set(root),
+        'sampler': StackSampler(threading.get_ident(), app.config['PROFILE_SAMPLE_INTERVAL']).start()
+        if mode == 'stacks' else None
+    }
+
+
+def _finish_trace(response):
+    profile = g.pop('_profile', None)
+    if profile is None:
+        return response
+    root = profile['root']
+    root.end = time.perf_counter()
+    _current_span.reset(profile['token'])
+    trace_id = next(_trace_ids)
+    current_app.trace_ring.add({
+        'id': trace_id,
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'status': response.status_code,
+        'started_at': time.time() - (root.end - root.start),
+        'duration_ms': round((root.end - root.start) * 1000, 3),
+        'spans': root.to_dict(),
+        'stacks': profile['sampler'].stop() if profile['sampler'] else None
+    })
+    response.headers['X-Trace-Id'] = str(trace_id)
+    return response
+
+
+def _teardown_trace(exc):
+    # Only reached with a live trace if after_request never ran; make sure
+    # the span does not leak into the next request served by this thread
+    profile = g.pop('_profile', None)
+    if profile is not None:
+        _current_span.reset(profile['token'])
+        if profile['sampler']:
+            profile['sampler'].stop()
+
+
+def init_profiling(app):
+    """Attach the trace ring and request hooks to an app"""
+    app.trace_ring = TraceRing(app.config['PROFILE_RING_SIZE'])
+    app.profile_settings = {
+        'sample_rate': app.config['PROFILE_SAMPLE_RATE'],
+        'stacks': app.config['PROFILE_STACKS']
+    }
+    app.before_request(_start_trace)
+    app.after_request(_finish_trace)
+    app.teardown_request(_teardown_trace)
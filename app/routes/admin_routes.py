@@ -0,0 +1,74 @@
+import hmac
+import math
+from functools import wraps
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request
+
+from app.profiling import make_profile_token
+
+admin_bp = Blueprint('admin', __name__)
+
+
+def admin_required(view):
+    """Require the X-Admin-Token header to match ADMIN_TOKEN; hide the endpoints when unset"""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        expected = current_app.config.get('ADMIN_TOKEN')
+        if not expected:
+            abort(404)
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), expected):
+            abort(403)
+        return view(*args, **kwargs)
+    return wrapped
+
+
+@admin_bp.route('/traces')
+@admin_required
+def list_traces():
+    """Summaries of the most recent profiled requests"""
+    traces = current_app.trace_ring.list()
+    return jsonify({
+        'traces': [
+            {key: trace[key] for key in ('id', 'method', 'path', 'status', 'started_at', 'duration_ms')}
+            for trace in reversed(traces)
+        ],
+        'count': len(traces)
+    })
+
+
+@admin_bp.route('/traces/<int:trace_id>')
+@admin_required
+def get_trace(trace_id):
+    """Full span tree for one trace, or its stack samples with ?format=collapsed"""
+    trace = current_app.trace_ring.get(trace_id)
+    if trace is None:
+        return jsonify({'error': 'Trace not found'}), 404
+    if request.args.get('format') == 'collapsed':
+        # Feed to flamegraph.pl or speedscope
+        return Response("\n".join(trace['stacks'] or []) + "\n", mimetype='text/plain')
+    return jsonify(trace)
+
+
+@admin_bp.route('/profiling', methods=['GET', 'POST'])
+@admin_required
+def profiling_settings():
+    """Read or change the profiling sample rate, and issue X-Profile tokens"""
+    settings = current_app.profile_settings
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        if 'sample_rate' in data:
+            try:
+                sample_rate = float(data['sample_rate'])
+            except (TypeError, ValueError):
+                sample_rate = math.nan
+            if not math.isfinite(sample_rate):
+                return jsonify({'error': 'sample_rate must be a number between 0 and 1'}), 400
+            settings['sample_rate'] = min(max(sample_rate, 0.0), 1.0)
+        if 'stacks' in data:
+            settings['stacks'] = bool(data['stacks'])
+    return jsonify({
+        **settings,
+        'token': make_profile_token(current_app, stacks=False),
+        'stacks_token': make_profile_token(current_app, stacks=True),
+        'token_max_age': current_app.config['PROFILE_TOKEN_MAX_AGE']
+    })
@@ -1,91 +1,194 @@
-from flask import Blueprint, jsonify, request, current_app
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, jsonify, request, current_app, g, send_file, url_for
 from flask_mail import Message
-import logging
 from datetime import datetime
-import openai
 from typing import Dict, Optional
 from firebase_admin import firestore
-import markdown  # For converting markdown to HTML
 from dotenv import load_dotenv
-import os
+from app.logging_config import SAMPLED
+from app.profiling import propagate, span
+from app.services.admission import admission_controlled, client_id
+from app.services.itinerary import (
+    build_itinerary_prompt, fallback_itinerary, generate_itinerary_parallel, trip_length
+)
+import re
+import time
 
 load_dotenv()
 
 api_bp = Blueprint('api', __name__)
 
-# DeepSeek API configuration
-DEEPSEEK_BASE_URL = "https://api.deepseek.com"
-DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY')
+PHOTO_REFERENCE_RE = re.compile(r'^[A-Za-z0-9_-]{10,2048}$')
+# Upper bound on place types fanned out by one /search_places request
+MAX_SEARCH_TYPES = 8
+
+def photo_url(photo_reference, width=400):
+    """Build a proxied photo URL so the Maps API key never reaches the browser"""
+    if not photo_reference:
+        return None
+    return url_for(
+        'api.get_photo',
+        photo_reference=photo_reference,
+        w=current_app.photo_cache.variant_width(width)
+    )
 
 class GoogleMapsService:
     def get_place_details(self, place_id):
         try:
-            details = current_app.gmaps.place(place_id=place_id)
+            details = current_app.cached_gmaps.place(place_id=place_id)
             return details.get('result', {})
         except Exception as e:
-            current_app.logger.error(f"Error fetching place details: {e}")
+            current_app.logger.error("Error fetching place details: %s", e)
             return {}
 
     def get_route(self, origin, destination, waypoints=None, mode='walking'):
-        try:
-            route = current_app.gmaps.directions(
-                origin,
-                destination,
-                waypoints=waypoints,
-                optimize_waypoints=True,
-                mode=mode
-            )
-            if route:
-                return {
-                    'total_distance': route[0]['legs'][0]['distance']['text'],
-                    'total_duration': route[0]['legs'][0]['duration']['text'],
-                    'steps': route[0]['legs'][0]['steps'],
-                    'polyline': route[0]['overview_polyline']['points']
-                }
-            return {}
-        except Exception as e:
-            current_app.logger.error(f"Error getting route: {e}")
-            return {}
+        client = current_app.gmaps
+        logger = current_app.logger
+
+        # May run on a background refresh thread, so it only uses captured objects
+        def fetch():
+            try:
+                route = client.directions(
+                    origin,
+                    destination,
+                    waypoints=waypoints,
+                    optimize_waypoints=True,
+                    mode=mode
+                )
+                if route:
+                    return {
+                        'total_distance': route[0]['legs'][0]['distance']['text'],
+                        'total_duration': route[0]['legs'][0]['duration']['text'],
+                        'steps': route[0]['legs'][0]['steps'],
+                        'polyline': route[0]['overview_polyline']['points']
+                    }
+                return {}
+            except Exception as e:
+                logger.error("Error getting route: %s", e)
+                return {}
+
+        with span('routes.lookup', mode=mode):
+            return current_app.route_cache.get_or_fetch(origin, destination, waypoints, mode, fetch)
 
 class PlacesService:
     def search_places(self, location, place_type, radius=5000):
+        return self.search_places_by_type(location, [place_type], radius)[place_type]
+
+    def search_places_by_type(self, location, place_types, radius=5000):
+        """
+        Search several place types around one location.
+
+        Types the catalog can answer are served locally. The rest share a
+        single geocode, run their nearby searches concurrently, and enrich
+        every unique place once even when it appears under several types.
+
+        Returns:
+            dict mapping each requested type to its list of places
+        """
+        results = {}
+        catalog = getattr(current_app, 'place_catalog', None)
+        if catalog is not None:
+            # Popular cities are answered from the local catalog
+            for place_type in place_types:
+                try:
+                    with span('places.catalog', type=place_type):
+                        places = catalog.search(location, place_type, radius)
+                except Exception as e:
+                    current_app.logger.error("Error searching place catalog: %s", e)
+                    places = None
+                if places is not None:
+                    results[place_type] = [self._present(place) for place in places]
+
+        missing = [place_type for place_type in place_types if place_type not in results]
+        if not missing:
+            return results
+
         try:
-            geocode_result = current_app.gmaps.geocode(location)
+            geocode_result = current_app.cached_gmaps.geocode(location)
             if not geocode_result:
-                return []
+                return dict(results, **{place_type: [] for place_type in missing})
             coords = geocode_result[0]['geometry']['location']
-            places_result = current_app.gmaps.places_nearby(
-                location=(coords['lat'], coords['lng']),
-                radius=radius,
-                type=place_type
-            )
-            places = places_result.get('results', [])
-            enhanced_places = []
-            for place in places:
-                # Fetch additional details for descriptions and photos
-                details = current_app.maps_service.get_place_details(place.get('place_id'))
-                photo_url = None
-                if details.get('photos'):
-                    photo_ref = details['photos'][0]['photo_reference']
-                    photo_url = (
-                        f"https://maps.googleapis.com/maps/api/place/photo"
-                        f"?maxwidth=400&photoreference={photo_ref}&key={current_app.config['GOOGLE_MAPS_API_KEY']}"
-                    )
-                description = details.get('editorial_summary', {}).get('overview', 'No description available.')
-                enhanced_places.append({
-                    'name': place.get('name'),
-                    'address': place.get('vicinity'),
-                    'location': place.get('geometry', {}).get('location'),
-                    'rating': place.get('rating'),
-                    'place_id': place.get('place_id'),
-                    'types': place.get('types', []),
-                    'photo': photo_url,
-                    'description': description
-                })
-            return enhanced_places
+            workers = current_app.config.get('PLACES_SEARCH_MAX_WORKERS', 8)
+
+            def nearby(place_type):
+                return current_app.cached_gmaps.places_nearby(
+                    location=(coords['lat'], coords['lng']),
+                    radius=radius,
+                    type=place_type
+                ).get('results', [])
+
+            with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+                futures = {place_type: executor.submit(propagate(nearby), place_type) for place_type in missing}
+                found = {}
+                for place_type, future in futures.items():
+                    # One failing type must not empty the others
+                    try:
+                        found[place_type] = future.result()
+                    except Exception as e:
+                        current_app.logger.error("Error searching %s places: %s", place_type, e)
+                        found[place_type] = []
+
+            unique = {}
+            for places in found.values():
+                for place in places:
+                    unique.setdefault(place.get('place_id'), place)
+
+            with span('places.format', count=len(unique)):
+                with ThreadPoolExecutor(max_workers=max(1, min(workers, len(unique)))) as executor:
+                    futures = {
+                        place_id: executor.submit(propagate(self._enhance), place)
+                        for place_id, place in unique.items()
+                    }
+                    enhanced = {place_id: future.result() for place_id, future in futures.items()}
+
+            if catalog is not None:
+                # Refresh misses and stale rows for cities the catalog covers;
+                # a failed write must not cost the caller the fetched results
+                try:
+                    city = catalog.find_city(location)
+                    if city is not None:
+                        catalog.upsert_places(city['key'], list(enhanced.values()))
+                except Exception as e:
+                    current_app.logger.error("Error updating place catalog for %s: %s", location, e)
+
+            for place_type, places in found.items():
+                results[place_type] = [self._present(enhanced[place.get('place_id')]) for place in places]
+            return results
         except Exception as e:
-            current_app.logger.error(f"Error searching places: {e}")
-            return []
+            current_app.logger.error("Error searching places: %s", e)
+            return dict(results, **{place_type: [] for place_type in missing})
+
+    def _enhance(self, place):
+        """Fetch additional details for descriptions and photos"""
+        details = current_app.maps_service.get_place_details(place.get('place_id'))
+        photo_reference = None
+        if details.get('photos'):
+            photo_reference = details['photos'][0]['photo_reference']
+        description = details.get('editorial_summary', {}).get('overview', 'No description available.')
+        return {
+            'name': place.get('name'),
+            'address': place.get('vicinity'),
+            'location': place.get('geometry', {}).get('location'),
+            'rating': place.get('rating'),
+            'user_ratings_total': place.get('user_ratings_total'),
+            'place_id': place.get('place_id'),
+            'types': place.get('types', []),
+            'photo_reference': photo_reference,
+            'description': description
+        }
+
+    def _present(self, place):
+        """Shape a place record for the API response"""
+        return {
+            'name': place.get('name'),
+            'address': place.get('address'),
+            'location': place.get('location'),
+            'rating': place.get('rating'),
+            'place_id': place.get('place_id'),
+            'types': place.get('types', []),
+            'photo': photo_url(place.get('photo_reference')),
+            'description': place.get('description')
+        }
         
 
 def generate_travel_guide(
@@ -96,7 +199,8 @@ def generate_travel_guide(
     budget: str = "Moderate",
     interests: str = "General sightseeing",
     email: Optional[str] = None,
-    special_requests: str = "None"
+    special_requests: str = "None",
+    generation_mode: Optional[str] = None
 ) -> Dict[str, any]:
     try:
         if not destination or not travelers or not budget:
@@ -106,49 +210,73 @@ def generate_travel_guide(
                 "data": {}
             }
 
-        number_of_days = "Not specified"
-        if start_date != "Not specified" and end_date != "Not specified":
+        number_of_days = trip_length(start_date, end_date)
+
+        itinerary = None
+        generation_stats = None
+        store = getattr(current_app, 'itinerary_store', None)
+        if store is not None and isinstance(number_of_days, int) and special_requests in ('None', ''):
+            # Popular destinations are pre-generated offline (see app.services.pregenerate)
+            stored = store.get(destination, number_of_days, travelers, budget, interests)
+            if stored:
+                itinerary = stored['itinerary']
+                generation_stats = {'mode': 'precomputed'}
+                current_app.logger.info("Serving pre-generated itinerary for %s", destination)
+
+        mode = generation_mode or current_app.config.get('ITINERARY_GENERATION_MODE', 'single')
+        if mode == 'auto':
+            parallel = (
+                isinstance(number_of_days, int)
+                and number_of_days >= current_app.config.get('ITINERARY_PARALLEL_MIN_DAYS', 5)
+            )
+        else:
+            parallel = mode == 'parallel' and isinstance(number_of_days, int)
+        max_parallel_days = current_app.config.get('ITINERARY_PARALLEL_MAX_DAYS', 14)
+        if parallel and number_of_days > max_parallel_days:
+            # Bounds the LLM calls a single request can trigger
+            current_app.logger.info(
+                "%s-day trip exceeds ITINERARY_PARALLEL_MAX_DAYS=%s; generating in one call",
+                number_of_days, max_parallel_days
+            )
+            parallel = False
+
+        if itinerary is None:
             try:
-                start = datetime.strptime(start_date, "%Y-%m-%d")
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-                if end > start:
-                    number_of_days = (end - start).days + 1
+                if parallel:
+                    current_app.logger.info("Generating %s-day itinerary per day for %s", number_of_days, destination)
+                    itinerary, generation_stats = generate_itinerary_parallel(
+                        current_app.cached_llm, destination, number_of_days, travelers, start_date, end_date,
+                        budget, interests, special_requests,
+                        max_parallel=current_app.config.get('ITINERARY_MAX_PARALLEL', 4)
+                    )
                 else:
-                    raise ValueError("End date must be after start date")
-            except ValueError as e:
-                number_of_days = f"Invalid date range: {str(e)}"
-
-        prompt = (
-            f"Hi! I’m excited to help you plan your {number_of_days}-day trip to {destination} "
-            f"for {travelers} travelers, from {start_date} to {end_date}. You’re working with a {budget} budget "
-            f"and enjoy {interests}. You also mentioned {special_requests if special_requests != 'None' else 'wanting a great experience'}.\n\n"
-            f"Create a detailed day-by-day itinerary with exact places to visit, where to eat, and fun activities. "
-            f"Add practical advice—how to get around, costs to expect, and things to watch out for (like safety, scams, or weather). "
-            f"Make it thorough for an email, covering everything needed for an amazing trip. "
-            f"If anything’s missing, add awesome suggestions matching the interests!"
-        )
+                    prompt = build_itinerary_prompt(
+                        destination, number_of_days, travelers, start_date, end_date,
+                        budget, interests, special_requests
+                    )
+                    current_app.logger.debug("Attempting DeepSeek API call with prompt: %.100s...", prompt, extra=SAMPLED)
+                    result = current_app.cached_llm.complete(prompt)
+                    itinerary = result['text']
+                    generation_stats = {
+                        'mode': 'single',
+                        'total_ms': round(result['latency_ms'], 1),
+                        'prompt_tokens': result['prompt_tokens'],
+                        'completion_tokens': result['completion_tokens'],
+                        'cached': result.get('cached', False)
+                    }
+                current_app.logger.info("DeepSeek API call succeeded")
+            except Exception as api_error:
+                current_app.logger.error("DeepSeek API error: %s", api_error)
+                itinerary = fallback_itinerary(destination, number_of_days)
+                generation_stats = {'mode': 'fallback'}
 
+        # Resolve the itinerary's stops server-side in one batch so the map
+        # does not need a search per place name
+        structured_itinerary = {'days': []}
         try:
-            client = openai.OpenAI(api_key=DEEPSEEK_API_KEY, base_url=DEEPSEEK_BASE_URL)
-            current_app.logger.info(f"Attempting DeepSeek API call with prompt: {prompt[:100]}...")
-            response = client.chat.completions.create(
-                model="deepseek-chat",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant"},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                stream=False
-            )
-            itinerary = response.choices[0].message.content
-            current_app.logger.info("DeepSeek API call succeeded")
-        except Exception as api_error:
-            current_app.logger.error(f"DeepSeek API error: {str(api_error)}")
-            itinerary = (
-                f"Here's a generic itinerary for your trip to {destination}:\n\n"
-                f"For {number_of_days} days, we recommend exploring local landmarks, "
-                f"enjoying regional cuisine, and relaxing at popular spots."
-            )
+            structured_itinerary = current_app.place_resolver.structure(itinerary, destination)
+        except Exception as e:
+            current_app.logger.error("Error structuring itinerary: %s", e)
 
         travel_guide_data = {
             "destination": destination,
@@ -160,21 +288,24 @@ def generate_travel_guide(
             "interests": interests,
             "special_requests": special_requests,
             "itinerary": itinerary,  # Raw markdown from DeepSeek
+            "structured_itinerary": structured_itinerary,
+            "generation_stats": generation_stats,
             "email": email,
             "generated_at": datetime.now().isoformat()
         }
 
         if email:
             try:
-                db = firestore.client()
-                db.collection('travel_guides').add({
-                    **travel_guide_data,
-                    "user_id": "anonymous",
-                    "generated_at": firestore.SERVER_TIMESTAMP
-                })
-                current_app.logger.info(f"Travel guide logged to Firestore for {email}")
+                with span('firestore.write'):
+                    db = firestore.client()
+                    db.collection('travel_guides').add({
+                        **travel_guide_data,
+                        "user_id": "anonymous",
+                        "generated_at": firestore.SERVER_TIMESTAMP
+                    })
+                current_app.logger.info("Travel guide logged to Firestore for %s", email)
             except Exception as e:
-                current_app.logger.error(f"Firestore error: {str(e)}")
+                current_app.logger.error("Firestore error: %s", e)
 
         return {
             "success": True,
@@ -183,7 +314,7 @@ def generate_travel_guide(
         }
 
     except Exception as e:
-        current_app.logger.error(f"Error generating travel guide: {str(e)}", exc_info=True)
+        current_app.logger.error("Error generating travel guide: %s", e, exc_info=True)
         return {
             "success": False,
             "message": f"Failed to generate travel guide: {str(e)}",
@@ -197,40 +328,109 @@ def initialize_services():
     if not hasattr(current_app, 'places_service'):
         current_app.places_service = PlacesService()
 
+@api_bp.before_request
+def start_capture():
+    if current_app.traffic_recorder is not None:
+        g._capture_started = time.perf_counter()
+
+@api_bp.after_request
+def record_capture(response):
+    started = g.pop('_capture_started', None)
+    if started is not None:
+        try:
+            current_app.traffic_recorder.record_request(
+                request, response.status_code, (time.perf_counter() - started) * 1000, client_id()
+            )
+        except Exception as e:
+            current_app.logger.error("Error capturing request: %s", e)
+    return response
+
 @api_bp.route('/search_places')
+@admission_controlled('read')
 def search_places():
     location = request.args.get('location')
-    place_type = request.args.get('type', 'tourist_attraction')
+    # Several types may be given as ?type=a,b or ?type=a&type=b
+    place_types = list(dict.fromkeys(
+        t.strip() for value in request.args.getlist('type') for t in value.split(',') if t.strip()
+    )) or ['tourist_attraction']
     radius = request.args.get('radius', 5000, type=int)
 
     if not location:
         return jsonify({'error': 'Location is required'}), 400
+    if len(place_types) > MAX_SEARCH_TYPES:
+        return jsonify({'error': f'At most {MAX_SEARCH_TYPES} types per request'}), 400
 
-    places = current_app.places_service.search_places(
+    if len(place_types) == 1:
+        places = current_app.places_service.search_places(
+            location=location,
+            place_type=place_types[0],
+            radius=radius
+        )
+        current_app.logger.info("Found %d places for location: %s", len(places), location, extra=SAMPLED)
+        with span('json.serialize'):
+            return jsonify({
+                'places': places,
+                'count': len(places)
+            })
+
+    places_by_type = current_app.places_service.search_places_by_type(
         location=location,
-        place_type=place_type,
+        place_types=place_types,
         radius=radius
     )
-    
-    current_app.logger.info(f"Found {len(places)} places for location: {location}")
-    return jsonify({
-        'places': places,
-        'count': len(places)
-    })
+    count = len({place['place_id'] for places in places_by_type.values() for place in places})
+    current_app.logger.info("Found %d places of %d types for location: %s",
+                            count, len(place_types), location, extra=SAMPLED)
+    with span('json.serialize'):
+        return jsonify({
+            'places_by_type': places_by_type,
+            'types': place_types,
+            'count': count
+        })
 
 @api_bp.route('/place/<place_id>')
+@admission_controlled('read')
 def get_place_details(place_id):
     details = current_app.maps_service.get_place_details(place_id)
     if not details:
-        current_app.logger.warning(f"Place not found: {place_id}")
+        current_app.logger.warning("Place not found: %s", place_id)
         return jsonify({'error': 'Place not found'}), 404
     return jsonify(details)
 
+@api_bp.route('/photo/<photo_reference>')
+@admission_controlled('read')
+def get_photo(photo_reference):
+    """Serve a place photo from the local cache, fetching it once on a miss"""
+    if not PHOTO_REFERENCE_RE.match(photo_reference):
+        return jsonify({'error': 'Invalid photo reference'}), 400
+
+    try:
+        cached = current_app.photo_cache.get(photo_reference, request.args.get('w', type=int))
+    except Exception as e:
+        current_app.logger.error("Error fetching photo: %s", e)
+        return jsonify({'error': 'Could not fetch photo'}), 502
+
+    if not cached:
+        return jsonify({'error': 'Photo not found'}), 404
+
+    path, blob_name = cached
+    # send_file hands the open file to the server's wsgi.file_wrapper (sendfile)
+    response = send_file(
+        path,
+        etag=blob_name.split('.')[0],
+        max_age=current_app.config['PHOTO_CACHE_MAX_AGE'],
+        conditional=True
+    )
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 @api_bp.route('/generate-travel-guide', methods=['POST'])
+@admission_controlled('generate')
 def create_travel_guide():
     try:
         data = request.get_json()
-        current_app.logger.info(f'Received travel guide request: {data}')
+        current_app.logger.info('Received travel guide request: %s', data, extra=SAMPLED)
 
         guide = generate_travel_guide(
             destination=data.get('destination', 'Your Destination'),
@@ -240,77 +440,54 @@ def create_travel_guide():
             budget=data.get('budget', 'Moderate'),
             interests=data.get('interests', 'General sightseeing'),
             email=data.get('email'),
-            special_requests=data.get('special_requests', 'None')
+            special_requests=data.get('special_requests', 'None'),
+            generation_mode=data.get('generation_mode')
         )
         
         if guide['success']:
-            current_app.logger.info(f'Travel guide generated successfully for {data["destination"]}')
+            current_app.logger.info('Travel guide generated successfully for %s', guide['data']['destination'])
             msg = Message(
                 subject=f"Your Travel Itinerary for {guide['data']['destination']}",
                 sender=("Travel Guide", current_app.config['MAIL_DEFAULT_SENDER']),
                 recipients=[guide['data']['email']]
             )
-            # Convert markdown itinerary to HTML
-            itinerary_html = markdown.markdown(guide['data']['itinerary'])
-            # Define HTML email body with CSS styling
-            msg.html = f"""
-            <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    h1 {{ color: #2c3e50; font-size: 24px; }}
-                    h2 {{ color: #2980b9; font-size: 20px; }}
-                    h3 {{ color: #3498db; font-size: 18px; }}
-                    strong {{ font-weight: bold; }}
-                    em {{ font-style: italic; }}
-                    ul {{ margin-left: 20px; }}
-                    .section {{ margin-bottom: 20px; }}
-                </style>
-            </head>
-            <body>
-                <h1>Hello!</h1>
-                <p>Here's your personalized travel guide for {guide['data']['destination']}!</p>
-
-                <div class="section">
-                    <h2>Trip Details</h2>
-                    <ul>
-                        <li><strong>Destination:</strong> {guide['data']['destination']}</li>
-                        <li><strong>Dates:</strong> {guide['data']['start_date']} to {guide['data']['end_date']}</li>
-                        <li><strong>Duration:</strong> {guide['data']['number_of_days']} days</li>
-                        <li><strong>Travelers:</strong> {guide['data']['travelers']}</li>
-                        <li><strong>Budget:</strong> {guide['data']['budget']}</li>
-                        <li><strong>Interests:</strong> {guide['data']['interests']}</li>
-                        <li><strong>Special Requests:</strong> {guide['data']['special_requests']}</li>
-                    </ul>
-                </div>
-
-                <div class="section">
-                    <h2>Your Itinerary</h2>
-                    {itinerary_html}
-                </div>
-
-                <p>Have a great trip!</p>
-                <p><strong>Best regards,</strong><br>Your Travel Guide Team</p>
-            </body>
-            </html>
-            """
-            current_app.logger.debug(f'Sending HTML email to {guide["data"]["email"]}')
-            current_app.extensions['mail'].send(msg)
-            current_app.logger.info(f'Email sent successfully to {guide["data"]["email"]}')
-            return jsonify(guide), 200
+            rendered = current_app.guide_renderer.render(guide['data'])
+            msg.html = rendered['html']
+            msg.body = rendered['text']
+            current_app.logger.debug('Sending HTML email to %s', guide['data']['email'], extra=SAMPLED)
+            with span('mail.send'):
+                current_app.extensions['mail'].send(msg)
+            current_app.logger.info('Email sent successfully to %s', guide['data']['email'])
+            with span('json.serialize'):
+                return jsonify(guide), 200
         else:
-            current_app.logger.warning(f'Travel guide generation failed: {guide}')
+            current_app.logger.warning('Travel guide generation failed: %s', guide['message'])
             return jsonify(guide), 400
             
     except Exception as e:
-        current_app.logger.error(f"Error in create_travel_guide: {str(e)}", exc_info=True)
+        current_app.logger.error("Error in create_travel_guide: %s", e, exc_info=True)
         return jsonify({
             'success': False,
             'message': f'Error generating travel guide: {str(e)}',
             'data': {}
         }), 500
 
+@api_bp.route('/stats')
+def get_stats():
+    """Report cache and rendering statistics for this worker"""
+    return jsonify({
+        'photos': current_app.photo_cache.stats(),
+        'render': current_app.guide_renderer.stats(),
+        'place_resolver': current_app.place_resolver.stats(),
+        'routes': current_app.route_cache.stats(),
+        'shared_cache': current_app.shared_cache.stats(),
+        'place_catalog': current_app.place_catalog.stats(),
+        'logging': current_app.log_handler.stats(),
+        'admission': {pool: controller.stats() for pool, controller in current_app.admission.items()}
+    })
+
 @api_bp.route('/route')
+@admission_controlled('read')
 def get_route():
     origin = request.args.get('origin')
     destination = request.args.get('destination')
@@ -328,7 +505,7 @@ def get_route():
     )
 
     if not route:
-        current_app.logger.warning(f"Could not find route from {origin} to {destination}")
+        current_app.logger.warning("Could not find route from %s to %s", origin, destination)
         return jsonify({'error': 'Could not find route'}), 404
 
     return jsonify(route)
\ No newline at end of file
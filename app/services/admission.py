@@ -0,0 +1,168 @@
+import math
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+from app.services.cache import LRUCache
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available; return (acquired, seconds until enough tokens)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True, 0.0
+            return False, (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available"""
+        while True:
+            acquired, wait = self.try_acquire(tokens)
+            if acquired:
+                return
+            time.sleep(wait)
+
+
+class ConcurrencyGate:
+    """
+    Caps concurrent executions, letting a bounded number of callers wait.
+
+    Callers beyond `max_concurrent` queue for up to `queue_timeout` seconds;
+    once `max_queue` callers are already waiting, new ones are refused at once.
+    """
+
+    def __init__(self, max_concurrent, max_queue=0, queue_timeout=0.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                return True
+            if self.waiting >= self.max_queue:
+                return False
+            self.waiting += 1
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self.active < self.max_concurrent,
+                    timeout=self.queue_timeout
+                )
+                if admitted:
+                    self.active += 1
+                return admitted
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+class AdmissionController:
+    """Per-client token-bucket rate limits plus a shared concurrency gate for one pool of endpoints"""
+
+    def __init__(self, name, rate=None, burst=None, max_concurrent=None, max_queue=0,
+                 queue_timeout=0.0, max_clients=10000):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.gate = ConcurrencyGate(max_concurrent, max_queue, queue_timeout) if max_concurrent else None
+        self._buckets = LRUCache(maxsize=max_clients)
+        self._buckets_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'admitted': 0, 'rate_limited': 0, 'overloaded': 0}
+
+    def _bucket(self, client_id):
+        with self._buckets_lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets.set(client_id, bucket)
+            return bucket
+
+    def enter(self, client_id):
+        """Admit a request or return (status, retry_after, message) describing the rejection"""
+        if self.rate:
+            allowed, wait = self._bucket(client_id).try_acquire()
+            if not allowed:
+                self._count('rate_limited')
+                return 429, wait, 'Too many requests, please slow down.'
+        if self.gate and not self.gate.acquire():
+            self._count('overloaded')
+            return 503, max(1.0, self.gate.queue_timeout), 'Server is busy, please retry shortly.'
+        self._count('admitted')
+        return None
+
+    def leave(self):
+        if self.gate:
+            self.gate.release()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        if self.gate:
+            stats.update(active=self.gate.active, waiting=self.gate.waiting,
+                         max_concurrent=self.gate.max_concurrent, max_queue=self.gate.max_queue)
+        return stats
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+
+def client_id():
+    """
+    Identify the caller by its peer address.
+
+    Behind proxies, ProxyFix (TRUSTED_PROXY_HOPS) has already replaced it
+    with the address our own proxy saw. The client-controlled leading
+    X-Forwarded-For entries are never used.
+    """
+    return request.remote_addr or 'unknown'
+
+
+def admission_controlled(pool):
+    """Route decorator applying the app's admission controller for `pool`"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            controller = current_app.admission.get(pool)
+            if controller is None:
+                return view(*args, **kwargs)
+            rejection = controller.enter(client_id())
+            if rejection:
+                status, retry_after, message = rejection
+                current_app.logger.warning("Rejected %s for %s (%d)", request.path, client_id(), status)
+                response = jsonify({'success': False, 'error': message})
+                response.status_code = status
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response
+            try:
+                return view(*args, **kwargs)
+            finally:
+                controller.leave()
+        return wrapped
+    return decorator
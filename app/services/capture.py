@@ -0,0 +1,121 @@
+"""
+Traffic capture for the API blueprint.
+
+When CAPTURE_FILE is set, every /api request is appended to a JSONL file
+with its timing and a sanitized copy of its parameters. With
+CAPTURE_UPSTREAM enabled, Google Maps and LLM responses are recorded to
+the same file so the replay harness (app.services.replay) can play them
+back instead of faking them.
+"""
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+
+# Request fields that may identify a person; replaced before writing
+SENSITIVE_FIELDS = {'email'}
+FREE_TEXT_FIELDS = {'special_requests'}
+# Arguments that change on every call and must not be part of an upstream key
+VOLATILE_KWARGS = {'departure_time'}
+
+
+def _digest(value):
+    return hashlib.sha256(str(value).encode()).hexdigest()[:12]
+
+
+def pseudonym(secret, value):
+    """Keyed digest of personal data; without the secret it cannot be brute-forced back"""
+    return hmac.new(secret, str(value).encode(), hashlib.sha256).hexdigest()[:16]
+
+
+def sanitize_payload(payload, secret):
+    """Copy of a JSON body with personal data replaced by placeholders, stable for one `secret`"""
+    if not isinstance(payload, dict):
+        return payload
+    sanitized = {}
+    for key, value in payload.items():
+        if key in SENSITIVE_FIELDS and value:
+            sanitized[key] = f"user-{pseudonym(secret, value)}@example.invalid"
+        elif key in FREE_TEXT_FIELDS and value and value != 'None':
+            sanitized[key] = "redacted request"
+        else:
+            sanitized[key] = value
+    return sanitized
+
+
+def upstream_key(args, kwargs):
+    """Stable key for an upstream call, ignoring arguments that vary per call"""
+    stable = {k: v for k, v in kwargs.items() if k not in VOLATILE_KWARGS}
+    return _digest(json.dumps([args, stable], sort_keys=True, default=str))
+
+
+class TrafficRecorder:
+    """
+    Thread-safe JSONL writer for captured requests and upstream responses.
+
+    Client addresses and emails are pseudonymised with an HMAC keyed by
+    `secret`. Without one, a random key is drawn per recorder, so
+    placeholders are consistent within a capture but cannot be linked
+    across captures or reversed from known addresses.
+    """
+
+    def __init__(self, path, secret=None):
+        self.path = path
+        self._secret = secret.encode() if secret else os.urandom(32)
+        self._file = open(path, 'a', encoding='utf-8', buffering=1)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def write(self, entry):
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.recorded += 1
+
+    def record_request(self, request, status, duration_ms, client):
+        self.write({
+            'type': 'request',
+            't': time.time() - duration_ms / 1000,
+            'method': request.method,
+            'path': request.path,
+            'args': request.args.to_dict(flat=False),
+            'json': sanitize_payload(request.get_json(silent=True), self._secret) if request.is_json else None,
+            'client': pseudonym(self._secret, client),
+            'status': status,
+            'duration_ms': round(duration_ms, 3)
+        })
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RecordingClient:
+    """Proxy that records every JSON-serializable upstream response to a TrafficRecorder"""
+
+    def __init__(self, client, label, recorder):
+        self._client = client
+        self._label = label
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        target = f"{self._label}.{name}"
+
+        def call(*args, **kwargs):
+            response = attr(*args, **kwargs)
+            if isinstance(response, (dict, list)):
+                self._recorder.write({
+                    'type': 'upstream',
+                    'target': target,
+                    'key': upstream_key(args, kwargs),
+                    'response': response
+                })
+            return response
+
+        self.__dict__[name] = call
+        return call
@@ -0,0 +1,11 @@
+import sys
+
+
+def read_lines(path):
+    """Read one entry per line from a file (or stdin for '-'), skipping blanks and comments"""
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        return [line.strip() for line in handle if line.strip() and not line.startswith('#')]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
@@ -21,32 +21,13 @@ def send_travel_guide_email(email: str, guide_data: dict) -> bool:
             recipients=[email]
         )
         
-        # Create email body
-        msg.body = f"""
-Hello!
-
-Here's your personalized travel guide for {guide_data['destination']}!
-
-Trip Details:
-- Destination: {guide_data['destination']}
-- Dates: {guide_data['start_date']} to {guide_data['end_date']}
-- Duration: {guide_data['number_of_days']} days
-- Travelers: {guide_data['travelers']}
-- Budget: {guide_data['budget']}
-- Interests: {guide_data['interests']}
-
-Your Itinerary:
-{guide_data['itinerary']}
-
-Have a great trip!
-
-Best regards,
-Your Travel Guide Team
-        """
+        rendered = current_app.guide_renderer.render(guide_data)
+        msg.body = rendered['text']
+        msg.html = rendered['html']
         
         mail.send(msg)
         return True
         
     except Exception as e:
-        current_app.logger.error(f"Failed to send email: {str(e)}")
+        current_app.logger.error("Failed to send email: %s", e)
         return False
@@ -20,6 +20,13 @@ class GoogleMapsService:
 
     def get_route(self, origin, destination, waypoints=None, mode="walking"):
         """Get route between two points with optional waypoints"""
+        # departure_time=now changes on every call, so the cache quantizes it instead
+        return current_app.route_cache.get_or_fetch(
+            origin, destination, waypoints, mode,
+            lambda: self._fetch_route(origin, destination, waypoints, mode)
+        )
+
+    def _fetch_route(self, origin, destination, waypoints, mode):
         try:
             route = self.client.directions(
                 origin,
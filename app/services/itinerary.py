@@ -0,0 +1,182 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from app.profiling import propagate, span
+
+
+def trip_length(start_date, end_date):
+    """Number of days between two YYYY-MM-DD dates (inclusive), or a descriptive string"""
+    if start_date == "Not specified" or end_date == "Not specified":
+        return "Not specified"
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        if end > start:
+            return (end - start).days + 1
+        raise ValueError("End date must be after start date")
+    except ValueError as e:
+        return f"Invalid date range: {str(e)}"
+
+
+def build_itinerary_prompt(destination, number_of_days, travelers, start_date, end_date,
+                           budget, interests, special_requests):
+    """Prompt asking the LLM for a complete day-by-day itinerary"""
+    return (
+        f"Hi! I’m excited to help you plan your {number_of_days}-day trip to {destination} "
+        f"for {travelers} travelers, from {start_date} to {end_date}. You’re working with a {budget} budget "
+        f"and enjoy {interests}. You also mentioned {special_requests if special_requests != 'None' else 'wanting a great experience'}.\n\n"
+        f"Create a detailed day-by-day itinerary with exact places to visit, where to eat, and fun activities. "
+        f"Start each day with a '## Day N: <theme>' heading and put the name of every specific place in **bold**. "
+        f"Add practical advice—how to get around, costs to expect, and things to watch out for (like safety, scams, or weather). "
+        f"Make it thorough for an email, covering everything needed for an amazing trip. "
+        f"If anything’s missing, add awesome suggestions matching the interests!"
+    )
+
+
+def fallback_itinerary(destination, number_of_days):
+    """Generic itinerary used when the LLM is unavailable"""
+    return (
+        f"Here's a generic itinerary for your trip to {destination}:\n\n"
+        f"For {number_of_days} days, we recommend exploring local landmarks, "
+        f"enjoying regional cuisine, and relaxing at popular spots."
+    )
+
+
+# "Day 3: theme", also as echoed by a day call: "## Day 3 (Friday 2025-01-03): theme"
+SKELETON_LINE_RE = re.compile(r'^[#*\s-]*Day\s+(\d+)\s*(?:\([^)]*\)\s*)?\**\s*[:.\-–—]\s*(.+)$', re.IGNORECASE)
+
+
+def build_skeleton_prompt(destination, number_of_days, travelers, budget, interests, special_requests):
+    """Prompt asking for a one-line theme per day, used to plan the per-day sections"""
+    return (
+        f"Outline a {number_of_days}-day trip to {destination} for {travelers} travelers "
+        f"with a {budget} budget who enjoy {interests}. "
+        f"Special requests: {special_requests if special_requests != 'None' else 'none'}.\n\n"
+        f"Reply with exactly {number_of_days} lines formatted as 'Day N: <theme> - <area or neighbourhood>', "
+        f"spreading the highlights across the days without repeating places, and nothing else."
+    )
+
+
+def parse_skeleton(text, number_of_days):
+    """Extract one theme per day from a skeleton completion, filling gaps with a free day"""
+    themes = {}
+    for line in text.splitlines():
+        match = SKELETON_LINE_RE.match(line.strip())
+        if match:
+            day = int(match.group(1))
+            if 1 <= day <= number_of_days and day not in themes:
+                themes[day] = match.group(2).strip(' *')
+    return [themes.get(day, "Free day to explore") for day in range(1, number_of_days + 1)]
+
+
+def build_day_prompt(day, themes, destination, travelers, start_date, budget, interests, special_requests):
+    """Prompt for a single day's section, given the plan for the whole trip"""
+    plan = "\n".join(f"Day {n}: {theme}" for n, theme in enumerate(themes, 1))
+    date_hint = ""
+    if start_date != "Not specified":
+        try:
+            date_hint = f" ({(datetime.strptime(start_date, '%Y-%m-%d') + timedelta(days=day - 1)).strftime('%A %Y-%m-%d')})"
+        except ValueError:
+            pass
+    return (
+        f"You are writing one section of a trip to {destination} for {travelers} travelers "
+        f"with a {budget} budget who enjoy {interests}. "
+        f"Special requests: {special_requests if special_requests != 'None' else 'none'}.\n\n"
+        f"The overall plan is:\n{plan}\n\n"
+        f"Write only Day {day}{date_hint}: {themes[day - 1]}. Give exact places to visit, where to eat "
+        f"and fun activities with timings and expected costs, as markdown bullet points, "
+        f"with the name of every specific place in **bold**. "
+        f"Do not cover other days."
+    )
+
+
+def build_tips_prompt(destination, number_of_days, budget, interests):
+    """Prompt for the practical-advice section that closes a per-day itinerary"""
+    return (
+        f"Write a short 'Practical Tips' section in markdown for a trip of {number_of_days} days to {destination} "
+        f"on a {budget} budget for travellers who enjoy {interests}: how to get around, costs to expect, "
+        f"and things to watch out for (like safety, scams, or weather)."
+    )
+
+
+def _stage_stats(result):
+    return {
+        'latency_ms': round(result['latency_ms'], 1),
+        'prompt_tokens': result['prompt_tokens'],
+        'completion_tokens': result['completion_tokens'],
+        'cached': result.get('cached', False)
+    }
+
+
+def _strip_day_heading(text):
+    """Drop a leading 'Day N' heading so sections can be renumbered consistently"""
+    lines = (text or "").strip().splitlines()
+    if lines and SKELETON_LINE_RE.match(lines[0].strip()):
+        lines = lines[1:]
+    return "\n".join(lines).strip()
+
+
+def generate_itinerary_parallel(llm, destination, number_of_days, travelers, start_date, end_date,
+                                budget, interests, special_requests, max_parallel=4):
+    """
+    Generate a long itinerary as a skeleton followed by concurrent per-day sections.
+
+    The skeleton call fixes a theme per day so days do not repeat each other;
+    the day sections and the practical tips are then generated with at most
+    `max_parallel` calls in flight and merged in day order. End-to-end
+    latency is roughly the skeleton call plus ceil((days + 1) / max_parallel)
+    waves of day calls, so it is skeleton + one day only when max_parallel
+    covers every day. Callers bound `number_of_days`, since the cost is
+    days + 2 LLM calls.
+
+    Returns:
+        tuple of (itinerary markdown, generation stats)
+    """
+    started = time.perf_counter()
+    with span('itinerary.skeleton'):
+        skeleton = llm.complete(build_skeleton_prompt(
+            destination, number_of_days, travelers, budget, interests, special_requests
+        ))
+    themes = parse_skeleton(skeleton['text'], number_of_days)
+
+    day_prompts = [
+        build_day_prompt(day, themes, destination, travelers, start_date, budget, interests, special_requests)
+        for day in range(1, number_of_days + 1)
+    ]
+    tips_prompt = build_tips_prompt(destination, number_of_days, budget, interests)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(day_prompts) + 1))) as executor:
+        day_futures = [executor.submit(propagate(llm.complete), prompt) for prompt in day_prompts]
+        tips_future = executor.submit(propagate(llm.complete), tips_prompt)
+
+        sections = []
+        day_stats = []
+        for day, future in enumerate(day_futures, 1):
+            heading = f"## Day {day}: {themes[day - 1]}"
+            try:
+                result = future.result()
+                sections.append(f"{heading}\n\n{_strip_day_heading(result['text'])}")
+                day_stats.append(dict(_stage_stats(result), day=day))
+            except Exception as e:
+                sections.append(f"{heading}\n\nA free day to explore {destination} at your own pace.")
+                day_stats.append({'day': day, 'error': str(e)})
+
+        tips_stats = None
+        try:
+            tips = tips_future.result()
+            sections.append(tips['text'].strip())
+            tips_stats = _stage_stats(tips)
+        except Exception as e:
+            tips_stats = {'error': str(e)}
+
+    stages = [_stage_stats(skeleton)] + day_stats + [tips_stats]
+    stats = {
+        'mode': 'parallel',
+        'stages': {'skeleton': _stage_stats(skeleton), 'days': day_stats, 'tips': tips_stats},
+        'total_ms': round((time.perf_counter() - started) * 1000, 1),
+        'prompt_tokens': sum(stage.get('prompt_tokens', 0) for stage in stages),
+        'completion_tokens': sum(stage.get('completion_tokens', 0) for stage in stages)
+    }
+    return "\n\n".join(sections), stats
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS itineraries (
+    key TEXT PRIMARY KEY,
+    destination TEXT NOT NULL,
+    number_of_days INTEGER NOT NULL,
+    travelers INTEGER,
+    budget TEXT NOT NULL,
+    interests TEXT NOT NULL,
+    itinerary TEXT NOT NULL,
+    model TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def normalize(value):
+    return " ".join(str(value).lower().split())
+
+
+class ItineraryStore:
+    """
+    SQLite store of pre-generated itineraries.
+
+    Entries are keyed by destination, trip length, party size, budget tier
+    and interests. Precomputed guides are generic with respect to dates, so
+    they are only served for requests without special requests.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(itineraries)")}
+            if 'travelers' not in columns:
+                conn.execute("ALTER TABLE itineraries ADD COLUMN travelers INTEGER")
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads; keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def key_for(destination, number_of_days, travelers, budget, interests):
+        interest_set = sorted(filter(None, (normalize(i) for i in str(interests).split(','))))
+        raw = "|".join([
+            normalize(destination), str(number_of_days), normalize(travelers),
+            normalize(budget), ",".join(interest_set)
+        ])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, destination, number_of_days, travelers, budget, interests):
+        row = self._connection().execute(
+            "SELECT * FROM itineraries WHERE key = ?",
+            (self.key_for(destination, number_of_days, travelers, budget, interests),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def contains(self, key):
+        return self._connection().execute(
+            "SELECT 1 FROM itineraries WHERE key = ?", (key,)
+        ).fetchone() is not None
+
+    def put(self, destination, number_of_days, travelers, budget, interests, itinerary,
+            model=None, prompt_tokens=None, completion_tokens=None):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO itineraries (key, destination, number_of_days, travelers, budget, "
+                "interests, itinerary, model, prompt_tokens, completion_tokens, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.key_for(destination, number_of_days, travelers, budget, interests),
+                    destination, number_of_days, travelers, budget, interests, itinerary,
+                    model, prompt_tokens, completion_tokens, time.time()
+                )
+            )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM itineraries").fetchone()[0]
@@ -0,0 +1,105 @@
+import re
+import threading
+import time
+
+import openai
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant"
+
+
+class DeepSeekLLM:
+    """Chat-completion client for the DeepSeek API (OpenAI-compatible)"""
+
+    def __init__(self, api_key, base_url="https://api.deepseek.com", model="deepseek-chat", temperature=0.7):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.temperature = temperature
+        self._client = None
+
+    @property
+    def client(self):
+        # Created lazily so a missing key surfaces as a call error, not an import error
+        if self._client is None:
+            self._client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+        return self._client
+
+    def complete(self, prompt, system=DEFAULT_SYSTEM_PROMPT, max_tokens=None):
+        """
+        Run a single completion.
+
+        Returns:
+            dict with 'text', 'prompt_tokens', 'completion_tokens' and 'latency_ms'
+        """
+        started = time.perf_counter()
+        kwargs = {'max_tokens': max_tokens} if max_tokens else {}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            stream=False,
+            **kwargs
+        )
+        usage = getattr(response, 'usage', None)
+        return {
+            'text': response.choices[0].message.content,
+            'prompt_tokens': getattr(usage, 'prompt_tokens', 0) or 0,
+            'completion_tokens': getattr(usage, 'completion_tokens', 0) or 0,
+            'latency_ms': (time.perf_counter() - started) * 1000
+        }
+
+
+class FakeLLM:
+    """
+    Offline stand-in for DeepSeekLLM.
+
+    Produces deterministic markdown shaped like a real itinerary (one
+    "## Day N" section per requested day) after an optional delay, so batch
+    jobs and load tests can run without network access or API costs.
+    """
+
+    model = "fake"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt, system=DEFAULT_SYSTEM_PROMPT, max_tokens=None):
+        with self._lock:
+            self.calls += 1
+        started = time.perf_counter()
+        if self.delay:
+            time.sleep(self.delay)
+        match = re.search(r'(\d+)-day', prompt)
+        days = int(match.group(1)) if match else 1
+        destination = re.search(r'trip to (.+?)(?: for |[.,\n])', prompt)
+        place = destination.group(1) if destination else "your destination"
+        text = "\n\n".join(
+            f"## Day {day}: Exploring {place}\n"
+            f"- **Morning:** Visit the **{place} Old Town**\n"
+            f"- **Lunch:** Try the local market stalls\n"
+            f"- **Afternoon:** Walk through **{place} Central Park**\n"
+            f"- **Evening:** Dinner at a neighbourhood bistro"
+            for day in range(1, days + 1)
+        )
+        return {
+            'text': text,
+            'prompt_tokens': len(prompt.split()),
+            'completion_tokens': len(text.split()),
+            'latency_ms': (time.perf_counter() - started) * 1000
+        }
+
+
+def create_llm(config):
+    """Build the LLM client selected by LLM_BACKEND ('deepseek' or 'fake')"""
+    if config.get('LLM_BACKEND') == 'fake':
+        return FakeLLM(delay=config.get('FAKE_LLM_DELAY', 0.0))
+    return DeepSeekLLM(
+        api_key=config.get('DEEPSEEK_API_KEY'),
+        base_url=config.get('DEEPSEEK_BASE_URL', "https://api.deepseek.com"),
+        model=config.get('DEEPSEEK_MODEL', "deepseek-chat")
+    )
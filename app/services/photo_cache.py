@@ -0,0 +1,131 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+from app.profiling import span
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class PhotoCache:
+    """
+    On-disk, content-addressed cache for Google Places photos.
+
+    Image bytes are stored once under the SHA-256 of their content, so the
+    same photo reached through different (rotating) photo references is kept
+    a single time. A small pointer file maps every (photo_reference, width)
+    variant to its blob. Concurrent misses for the same variant are collapsed
+    into a single upstream fetch.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(self, client, cache_dir, widths=(200, 400, 800)):
+        self.client = client
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.widths = sorted(set(int(w) for w in widths))
+        self._blob_dir = os.path.join(self.cache_dir, 'blobs')
+        self._ref_dir = os.path.join(self.cache_dir, 'refs')
+        os.makedirs(self._blob_dir, exist_ok=True)
+        os.makedirs(self._ref_dir, exist_ok=True)
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'upstream_fetches': 0, 'upstream_errors': 0}
+
+    def variant_width(self, requested=None):
+        """Snap a requested width to the smallest configured variant that covers it"""
+        if not requested:
+            return 400 if 400 in self.widths else self.widths[len(self.widths) // 2]
+        for width in self.widths:
+            if width >= requested:
+                return width
+        return self.widths[-1]
+
+    def get(self, photo_reference, width=None):
+        """
+        Return (path, blob_name) for a photo variant, fetching it upstream on a miss.
+
+        Returns None when the upstream returned no image data.
+        """
+        width = self.variant_width(width)
+        key = hashlib.sha256(f"{photo_reference}:{width}".encode()).hexdigest()
+        ref_path = os.path.join(self._ref_dir, key[:2], key)
+
+        blob_name = self._read_ref(ref_path)
+        if blob_name:
+            self._count('hits')
+            return self._blob_path(blob_name), blob_name
+
+        with self._locks[int(key[:8], 16) % self.LOCK_STRIPES]:
+            # Another thread may have filled the variant while we waited
+            blob_name = self._read_ref(ref_path)
+            if blob_name:
+                self._count('hits')
+            else:
+                self._count('misses')
+                with span('photo.fetch', width=width):
+                    blob_name = self._fetch(photo_reference, width)
+                if not blob_name:
+                    return None
+                self._write_atomic(ref_path, blob_name.encode())
+
+        return self._blob_path(blob_name), blob_name
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats, widths=self.widths)
+
+    def _fetch(self, photo_reference, width):
+        """Stream a photo from the Places API into the blob store"""
+        self._count('upstream_fetches')
+        fd, tmp_path = tempfile.mkstemp(dir=self._blob_dir, suffix='.tmp')
+        digest = hashlib.sha256()
+        head = b''
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in self.client.places_photo(photo_reference, max_width=width):
+                    if not chunk:
+                        continue
+                    if len(head) < len(PNG_SIGNATURE):
+                        head += chunk[:len(PNG_SIGNATURE)]
+                    digest.update(chunk)
+                    f.write(chunk)
+            if not head:
+                os.remove(tmp_path)
+                return None
+            extension = 'png' if head.startswith(PNG_SIGNATURE) else 'jpg'
+            blob_name = f"{digest.hexdigest()}.{extension}"
+            blob_path = self._blob_path(blob_name)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(tmp_path, blob_path)
+            return blob_name
+        except Exception:
+            self._count('upstream_errors')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _blob_path(self, blob_name):
+        return os.path.join(self._blob_dir, blob_name[:2], blob_name)
+
+    def _read_ref(self, ref_path):
+        try:
+            with open(ref_path, 'rb') as f:
+                blob_name = f.read().decode()
+        except FileNotFoundError:
+            return None
+        # A pointer whose blob was pruned counts as a miss
+        return blob_name if os.path.exists(self._blob_path(blob_name)) else None
+
+    def _write_atomic(self, path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
@@ -0,0 +1,297 @@
+"""
+Local catalog of place data for the most-searched cities.
+
+Place data for chosen cities is snapshotted into SQLite with an FTS5 index
+over names, types, addresses and descriptions, and a coarse lat/lng grid
+index for radius queries. PlacesService answers from the catalog first and
+only goes upstream for cities or types it does not cover, radii beyond the
+one a city was imported with, or rows older than the configured maximum
+age. Rows refreshed by upstream write-back count as fresh again.
+
+Import usage:
+    python -m app.services.place_catalog --cities cities.txt \\
+        --types tourist_attraction,restaurant,museum,park --radius 5000
+"""
+import argparse
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Grid cell size in degrees (~1.1 km of latitude)
+CELL_DEG = 0.01
+# Import radius assumed for cities catalogued before it was recorded
+DEFAULT_IMPORT_RADIUS = 5000
+EARTH_RADIUS_M = 6371000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cities (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    imported_at REAL NOT NULL,
+    radius REAL
+);
+CREATE TABLE IF NOT EXISTS city_aliases (
+    alias TEXT PRIMARY KEY,
+    city_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS places (
+    place_id TEXT PRIMARY KEY,
+    city_key TEXT NOT NULL,
+    name TEXT,
+    address TEXT,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    cell_y INTEGER NOT NULL,
+    cell_x INTEGER NOT NULL,
+    rating REAL,
+    user_ratings_total INTEGER,
+    types TEXT,
+    photo_reference TEXT,
+    description TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS places_cell ON places (cell_y, cell_x);
+CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+    place_id UNINDEXED, name, types, address, description
+);
+"""
+
+
+def normalize(value):
+    return " ".join(str(value).lower().replace(',', ' ').split())
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def _cell(value):
+    return math.floor(value / CELL_DEG)
+
+
+def _fts_phrase(value):
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class PlaceCatalog:
+    """SQLite-backed snapshot of place data with FTS5 and grid indexes"""
+
+    def __init__(self, path, max_age=30 * 24 * 3600):
+        self.path = os.path.abspath(path)
+        self.max_age = max_age
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(cities)")}
+            if 'radius' not in columns:
+                conn.execute("ALTER TABLE cities ADD COLUMN radius REAL")
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads; keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def find_city(self, location):
+        """Return the catalogued city row for a free-text location, or None"""
+        return self._connection().execute(
+            "SELECT c.* FROM city_aliases a JOIN cities c ON c.key = a.city_key WHERE a.alias = ?",
+            (normalize(location),)
+        ).fetchone()
+
+    def search(self, location, place_type=None, radius=5000, query=None):
+        """
+        Search catalogued places around a city.
+
+        Returns:
+            list of place dicts, or None when the catalog cannot answer
+            (unknown city, type not imported, radius larger than the
+            import, or stale rows) and the caller should go upstream
+        """
+        city = self.find_city(location)
+        if city is None:
+            return None
+        if radius > (city['radius'] or DEFAULT_IMPORT_RADIUS):
+            return None
+        now = time.time()
+
+        lat, lng = city['lat'], city['lng']
+        lat_span = radius / 111320
+        lng_span = radius / (111320 * max(math.cos(math.radians(lat)), 0.01))
+        sql = [
+            "SELECT p.* FROM places p",
+            "WHERE p.cell_y BETWEEN ? AND ? AND p.cell_x BETWEEN ? AND ?"
+        ]
+        params = [_cell(lat - lat_span), _cell(lat + lat_span), _cell(lng - lng_span), _cell(lng + lng_span)]
+        match = []
+        if place_type:
+            match.append(f"types : {_fts_phrase(place_type)}")
+        if query:
+            match.append(" ".join(_fts_phrase(term) for term in query.split()))
+        if match:
+            sql.append("AND p.place_id IN (SELECT place_id FROM places_fts WHERE places_fts MATCH ?)")
+            params.append(" AND ".join(f"({m})" for m in match))
+
+        rows = self._connection().execute(" ".join(sql), params).fetchall()
+        places = [row for row in rows if haversine_m(lat, lng, row['lat'], row['lng']) <= radius]
+        if not places:
+            return None
+        if any(now - row['fetched_at'] > self.max_age for row in places):
+            return None
+        places.sort(key=lambda row: (row['rating'] is None, -(row['rating'] or 0)))
+        return [self._to_place(row) for row in places]
+
+    @staticmethod
+    def _to_place(row):
+        return {
+            'place_id': row['place_id'],
+            'name': row['name'],
+            'address': row['address'],
+            'location': {'lat': row['lat'], 'lng': row['lng']},
+            'rating': row['rating'],
+            'user_ratings_total': row['user_ratings_total'],
+            'types': row['types'].split() if row['types'] else [],
+            'photo_reference': row['photo_reference'],
+            'description': row['description']
+        }
+
+    def add_city(self, name, lat, lng, aliases=(), radius=DEFAULT_IMPORT_RADIUS):
+        key = normalize(name)
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cities (key, name, lat, lng, imported_at, radius) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, name, lat, lng, time.time(), radius)
+            )
+            for alias in {key, *(normalize(a) for a in aliases if a)}:
+                conn.execute("INSERT OR REPLACE INTO city_aliases VALUES (?, ?)", (alias, key))
+        return key
+
+    def upsert_places(self, city_key, places):
+        """Insert or refresh places given in the PlacesService result format"""
+        now = time.time()
+        with self._connection() as conn:
+            for place in places:
+                location = place.get('location') or {}
+                if not place.get('place_id') or 'lat' not in location:
+                    continue
+                types = " ".join(place.get('types') or [])
+                conn.execute("DELETE FROM places_fts WHERE place_id = ?", (place['place_id'],))
+                conn.execute(
+                    "INSERT OR REPLACE INTO places VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        place['place_id'], city_key, place.get('name'), place.get('address'),
+                        location['lat'], location['lng'], _cell(location['lat']), _cell(location['lng']),
+                        place.get('rating'), place.get('user_ratings_total'), types,
+                        place.get('photo_reference'), place.get('description'), now
+                    )
+                )
+                conn.execute(
+                    "INSERT INTO places_fts VALUES (?, ?, ?, ?, ?)",
+                    (place['place_id'], place.get('name'), types, place.get('address'), place.get('description'))
+                )
+
+    def stats(self):
+        conn = self._connection()
+        return {
+            'cities': conn.execute("SELECT COUNT(*) FROM cities").fetchone()[0],
+            'places': conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+        }
+
+
+def fetch_city_places(client, location, place_types, radius=5000, max_workers=8):
+    """Collect places of the given types around a city from the Places API"""
+    geocode_result = client.geocode(location)
+    if not geocode_result:
+        raise ValueError(f"Could not geocode {location}")
+    coords = geocode_result[0]['geometry']['location']
+    formatted_address = geocode_result[0].get('formatted_address')
+
+    found = {}
+    for place_type in place_types:
+        response = client.places_nearby(location=(coords['lat'], coords['lng']), radius=radius, type=place_type)
+        while True:
+            for place in response.get('results', []):
+                found.setdefault(place['place_id'], place)
+            token = response.get('next_page_token')
+            if not token:
+                break
+            # Page tokens only become valid after a short delay
+            time.sleep(2)
+            response = client.places_nearby(page_token=token)
+
+    def enrich(place):
+        details = client.place(place['place_id'], fields=['editorial_summary', 'photo']).get('result', {})
+        photos = details.get('photos') or place.get('photos') or []
+        return {
+            'place_id': place['place_id'],
+            'name': place.get('name'),
+            'address': place.get('vicinity'),
+            'location': place.get('geometry', {}).get('location'),
+            'rating': place.get('rating'),
+            'user_ratings_total': place.get('user_ratings_total'),
+            'types': place.get('types', []),
+            'photo_reference': photos[0].get('photo_reference') if photos else None,
+            'description': details.get('editorial_summary', {}).get('overview', 'No description available.')
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        places = list(executor.map(enrich, found.values()))
+    return coords, formatted_address, places
+
+
+def main(argv=None):
+    from googlemaps import Client
+    from app.config import Config
+    from app.services.cli_input import read_lines
+
+    parser = argparse.ArgumentParser(description="Import place data for popular cities into the local catalog")
+    parser.add_argument('--cities', required=True, help="File with one city per line, or '-' for stdin")
+    parser.add_argument('--types', default='tourist_attraction,restaurant,museum,park,lodging')
+    parser.add_argument('--radius', type=int, default=5000)
+    parser.add_argument('--db', default=Config.PLACE_CATALOG_PATH)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    cities = read_lines(args.cities)
+
+    client = Client(key=Config.GOOGLE_MAPS_API_KEY)
+    catalog = PlaceCatalog(args.db)
+    place_types = [t.strip() for t in args.types.split(',') if t.strip()]
+    failed = 0
+    for city in cities:
+        try:
+            coords, formatted_address, places = fetch_city_places(client, city, place_types, args.radius)
+            city_key = catalog.add_city(
+                city, coords['lat'], coords['lng'], aliases=[formatted_address], radius=args.radius
+            )
+            catalog.upsert_places(city_key, places)
+            logger.info("Imported %d places for %s", len(places), city)
+        except Exception as e:
+            failed += 1
+            logger.error("Failed to import %s: %s", city, e)
+
+    print(f"Catalog now holds {catalog.stats()['places']} places in {catalog.stats()['cities']} cities")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from app.profiling import propagate, span
+from app.services.cache import LRUCache
+
+DAY_HEADING_RE = re.compile(r'^(?:#+\s*|\*\*)\s*Day\s+(\d+)\b[\s:.\-–—*]*(.*?)\**\s*$', re.IGNORECASE)
+BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+# Bold labels such as "Morning:" or "Cost" are formatting, not places
+NON_PLACE_WORDS = {
+    'morning', 'afternoon', 'evening', 'night', 'lunch', 'dinner', 'breakfast', 'brunch',
+    'cost', 'costs', 'tip', 'tips', 'note', 'budget', 'transport', 'getting around',
+    'why', 'where', 'when', 'what', 'how', 'option', 'alternative', 'day'
+}
+
+
+def _normalize(value):
+    return " ".join(str(value).lower().split())
+
+
+def parse_itinerary(markdown_text):
+    """
+    Extract a day/stop structure from itinerary markdown.
+
+    Days come from "Day N" headings; stops are the bolded place names in
+    each day's section (the generation prompts ask for places in bold). A
+    day's section ends at the next heading of the same or a higher level,
+    so a closing "## Practical Tips" is not read as part of the last day.
+
+    Returns:
+        list of {'day', 'title', 'stops': [{'name'}]} in document order
+    """
+    days = []
+    current = None
+    current_level = 0
+    for line in (markdown_text or "").splitlines():
+        stripped = line.strip()
+        level = len(stripped) - len(stripped.lstrip('#'))
+        heading = DAY_HEADING_RE.match(stripped)
+        if heading:
+            current = {'day': int(heading.group(1)), 'title': heading.group(2).strip(), 'stops': []}
+            # Bold "**Day N**" headings rank like "## Day N"
+            current_level = level or 2
+            days.append(current)
+            continue
+        if level:
+            if current is not None and level <= current_level:
+                current = None
+            continue
+        if current is None:
+            continue
+        for match in BOLD_RE.finditer(stripped):
+            name = match.group(1).strip().strip('*').strip()
+            if name.endswith(':') or not 3 <= len(name) <= 80:
+                continue
+            if _normalize(name).rstrip(':') in NON_PLACE_WORDS:
+                continue
+            if all(stop['name'] != name for stop in current['stops']):
+                current['stops'].append({'name': name})
+    return days
+
+
+class PlaceResolver:
+    """
+    Resolves place names to coordinates and place_ids in one concurrent batch.
+
+    Names are deduplicated within a batch and results (including misses) are
+    cached, so the same landmark across days and guides is looked up once.
+    """
+
+    def __init__(self, client, cache_size=5000, cache_ttl=7 * 24 * 3600, max_workers=8):
+        self.client = client
+        self.max_workers = max_workers
+        self._cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def _lookup(self, name, destination):
+        result = self.client.find_place(
+            f"{name}, {destination}",
+            'textquery',
+            fields=['place_id', 'name', 'geometry/location', 'formatted_address']
+        )
+        candidates = result.get('candidates', [])
+        if not candidates:
+            return {}
+        candidate = candidates[0]
+        return {
+            'place_id': candidate.get('place_id'),
+            'location': candidate.get('geometry', {}).get('location'),
+            'address': candidate.get('formatted_address')
+        }
+
+    def resolve(self, names, destination):
+        """Return {name: {'place_id', 'location', 'address'} or {}} for every name"""
+        keys = {name: f"{_normalize(name)}|{_normalize(destination)}" for name in names}
+        resolved = {}
+        missing = {}
+        for name, key in keys.items():
+            cached = self._cache.get(key)
+            if cached is not None:
+                resolved[key] = cached
+            else:
+                missing.setdefault(key, name)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                futures = {
+                    key: executor.submit(propagate(self._lookup), name, destination)
+                    for key, name in missing.items()
+                }
+                for key, future in futures.items():
+                    try:
+                        resolved[key] = future.result()
+                        self._cache.set(key, resolved[key])
+                    except Exception:
+                        # Transient upstream errors are not cached
+                        resolved[key] = {}
+
+        return {name: resolved[key] for name, key in keys.items()}
+
+    def structure(self, markdown_text, destination):
+        """Parse an itinerary and attach resolved place data to every stop"""
+        with span('itinerary.parse'):
+            days = parse_itinerary(markdown_text)
+        names = [stop['name'] for day in days for stop in day['stops']]
+        with span('places.resolve', names=len(names)):
+            places = self.resolve(names, destination) if names else {}
+        for day in days:
+            for stop in day['stops']:
+                stop.update(places.get(stop['name'], {}))
+        return {'days': days}
+
+    def stats(self):
+        return self._cache.stats()
@@ -0,0 +1,128 @@
+"""
+Offline batch pre-generation of itineraries for popular destinations.
+
+Generates every destination x day count x budget tier combination
+concurrently under an LLM rate limit and stores the results in the
+itinerary store. Combinations already in the store are skipped, so an
+interrupted run can simply be restarted.
+
+Usage:
+    python -m app.services.pregenerate --destinations destinations.txt \\
+        --days 3,5,7 --budgets Budget,Moderate,Luxury
+"""
+import argparse
+import itertools
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.config import Config
+from app.services.admission import TokenBucket
+from app.services.cli_input import read_lines
+from app.services.itinerary import build_itinerary_prompt
+from app.services.itinerary_store import ItineraryStore
+from app.services.llm import FakeLLM, create_llm
+
+logger = logging.getLogger(__name__)
+
+
+def pregenerate(llm, store, destinations, day_counts, budgets, interests="General sightseeing",
+                travelers=2, concurrency=4, rate=1.0):
+    """
+    Generate and store all missing itineraries.
+
+    Returns:
+        dict with 'total', 'skipped', 'generated', 'failed' and 'elapsed' counts
+    """
+    limiter = TokenBucket(rate, capacity=max(1, concurrency))
+    jobs = [
+        (destination, days, budget)
+        for destination, days, budget in itertools.product(destinations, day_counts, budgets)
+        if not store.contains(store.key_for(destination, days, travelers, budget, interests))
+    ]
+    summary = {
+        'total': len(destinations) * len(day_counts) * len(budgets),
+        'skipped': 0, 'generated': 0, 'failed': 0
+    }
+    summary['skipped'] = summary['total'] - len(jobs)
+
+    def run(destination, days, budget):
+        limiter.acquire()
+        prompt = build_itinerary_prompt(
+            destination, days, travelers, "Not specified", "Not specified",
+            budget, interests, "None"
+        )
+        result = llm.complete(prompt)
+        store.put(
+            destination, days, travelers, budget, interests, result['text'],
+            model=getattr(llm, 'model', None),
+            prompt_tokens=result['prompt_tokens'],
+            completion_tokens=result['completion_tokens']
+        )
+        return result
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(run, *job): job for job in jobs}
+        try:
+            for future in as_completed(futures):
+                destination, days, budget = futures[future]
+                try:
+                    future.result()
+                    summary['generated'] += 1
+                    logger.info("Generated %s / %s days / %s (%d/%d)",
+                                destination, days, budget, summary['generated'], len(jobs))
+                except Exception as e:
+                    summary['failed'] += 1
+                    logger.warning("Failed %s / %s days / %s: %s", destination, days, budget, e)
+        except KeyboardInterrupt:
+            # Finished itineraries are already stored; a re-run picks up the rest
+            for future in futures:
+                future.cancel()
+            raise
+    summary['elapsed'] = time.monotonic() - started
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate itineraries for popular destinations")
+    parser.add_argument('--destinations', required=True, help="File with one destination per line, or '-' for stdin")
+    parser.add_argument('--days', default='3,5,7', help="Comma-separated trip lengths")
+    parser.add_argument('--budgets', default='Budget,Moderate,Luxury', help="Comma-separated budget tiers")
+    parser.add_argument('--interests', default='General sightseeing')
+    parser.add_argument('--travelers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=1.0, help="Maximum LLM calls per second")
+    parser.add_argument('--store', default=Config.ITINERARY_STORE_PATH)
+    parser.add_argument('--fake-llm', action='store_true', help="Use the offline fake LLM")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    llm = FakeLLM() if args.fake_llm else create_llm(vars(Config))
+    store = ItineraryStore(args.store)
+    try:
+        summary = pregenerate(
+            llm, store,
+            destinations=read_lines(args.destinations),
+            day_counts=[int(d) for d in args.days.split(',')],
+            budgets=[b.strip() for b in args.budgets.split(',')],
+            interests=args.interests,
+            travelers=args.travelers,
+            concurrency=args.concurrency,
+            rate=args.rate
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted; re-run the same command to resume.")
+        return 130
+
+    print(
+        f"{summary['generated']} generated, {summary['skipped']} already stored, "
+        f"{summary['failed']} failed out of {summary['total']} in {summary['elapsed']:.1f}s"
+    )
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import markdown
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+from app.profiling import span
+from app.services.cache import LRUCache
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'email')
+
+# Fields of a guide that appear in the rendered email
+RENDERED_FIELDS = (
+    'destination', 'start_date', 'end_date', 'number_of_days', 'travelers',
+    'budget', 'interests', 'special_requests', 'itinerary'
+)
+
+
+class GuideRenderer:
+    """
+    Renders travel guides to HTML and plain-text email bodies.
+
+    Templates are compiled once at construction and a single Markdown
+    converter is reused. Output is cached by a hash of the guide content, so
+    a guide that is viewed, emailed and re-sent is rendered only once.
+    """
+
+    def __init__(self, cache_size=256, template_dir=TEMPLATE_DIR):
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(['html']),
+            auto_reload=False,
+            keep_trailing_newline=True
+        )
+        self.html_template = self.env.get_template('travel_guide.html')
+        self.text_template = self.env.get_template('travel_guide.txt')
+        # markdown.Markdown instances keep per-document state and are not thread-safe
+        self._markdown = markdown.Markdown()
+        self._markdown_lock = threading.Lock()
+        self._cache = LRUCache(maxsize=cache_size)
+        self._stats_lock = threading.Lock()
+        self._stats = {'renders': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0}
+
+    @staticmethod
+    def guide_hash(guide):
+        """Stable hash of the guide fields that affect the rendered output"""
+        payload = json.dumps({field: guide.get(field) for field in RENDERED_FIELDS}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def markdown_to_html(self, text):
+        with self._markdown_lock:
+            return self._markdown.reset().convert(text or '')
+
+    def render(self, guide):
+        """Return {'html', 'text', 'itinerary_html'} for a guide, rendering on a cache miss"""
+        key = self.guide_hash(guide)
+        rendered = self._cache.get(key)
+        if rendered is not None:
+            return rendered
+
+        started = time.perf_counter()
+        with span('render.markdown'):
+            itinerary_html = self.markdown_to_html(guide.get('itinerary'))
+        with span('render.templates'):
+            rendered = {
+                'html': self.html_template.render(guide=guide, itinerary_html=Markup(itinerary_html)),
+                'text': self.text_template.render(guide=guide),
+                'itinerary_html': itinerary_html
+            }
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._cache.set(key, rendered)
+
+        with self._stats_lock:
+            self._stats['renders'] += 1
+            self._stats['total_ms'] += elapsed_ms
+            self._stats['last_ms'] = elapsed_ms
+            self._stats['max_ms'] = max(self._stats['max_ms'], elapsed_ms)
+        return rendered
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['avg_ms'] = stats['total_ms'] / stats['renders'] if stats['renders'] else 0.0
+        stats['cache'] = self._cache.stats()
+        return stats
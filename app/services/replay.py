@@ -0,0 +1,305 @@
+"""
+Replay captured traffic against an in-process app and report latency.
+
+Requests recorded with CAPTURE_FILE are re-issued against a fresh
+create_app instance at their original pacing (or accelerated with
+--speed). Google Maps and LLM calls are answered either by offline fakes
+or by playing back upstream responses recorded with CAPTURE_UPSTREAM.
+
+Usage:
+    python -m app.services.replay capture.jsonl --speed 10 --upstream recorded
+"""
+import argparse
+import collections
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.capture import upstream_key
+from app.services.llm import FakeLLM
+
+
+class FakeMapsClient:
+    """Offline stand-in for googlemaps.Client returning small synthetic responses"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def _pause(self):
+        if self.delay:
+            time.sleep(self.delay)
+
+    def geocode(self, address, **kwargs):
+        self._pause()
+        seed = sum(map(ord, str(address)))
+        return [{
+            'formatted_address': str(address),
+            'geometry': {'location': {'lat': (seed % 180) - 90 + 0.5, 'lng': (seed % 360) - 180 + 0.5}}
+        }]
+
+    def places_nearby(self, location=None, radius=None, type=None, **kwargs):
+        self._pause()
+        lat, lng = location if location else (0.0, 0.0)
+        return {'results': [
+            {
+                'place_id': f"fake-{type}-{i}-{lat:.3f}-{lng:.3f}",
+                'name': f"{(type or 'place').replace('_', ' ').title()} {i}",
+                'vicinity': f"{i} Example Street",
+                'geometry': {'location': {'lat': lat + i / 1000, 'lng': lng + i / 1000}},
+                'rating': 4.0 + (i % 10) / 10,
+                'user_ratings_total': 100 + i,
+                'types': [type or 'point_of_interest']
+            }
+            for i in range(20)
+        ]}
+
+    def place(self, place_id=None, **kwargs):
+        self._pause()
+        return {'result': {
+            'place_id': place_id,
+            'name': f"Place {place_id}",
+            'editorial_summary': {'overview': 'A synthetic place used for load testing.'},
+            'photos': [{'photo_reference': f"fakephotoref{abs(hash(place_id)) % 10 ** 12:012d}"}]
+        }}
+
+    def find_place(self, input, input_type, **kwargs):
+        self._pause()
+        return {'candidates': [{
+            'place_id': f"fake-find-{abs(hash(input)) % 10 ** 8}",
+            'name': input,
+            'geometry': {'location': {'lat': 0.0, 'lng': 0.0}},
+            'formatted_address': input
+        }]}
+
+    def directions(self, origin, destination, **kwargs):
+        self._pause()
+        return [{
+            'legs': [{
+                'distance': {'text': '2.0 km', 'value': 2000},
+                'duration': {'text': '25 mins', 'value': 1500},
+                'steps': [{'html_instructions': f"Head from {origin} to {destination}"}]
+            }],
+            'overview_polyline': {'points': 'fake_polyline'},
+            'bounds': {}
+        }]
+
+    def places_photo(self, photo_reference, max_width=None, **kwargs):
+        self._pause()
+        yield b'\xff\xd8\xff\xe0' + photo_reference.encode()[:32] + b'\xff\xd9'
+
+
+class PlaybackClient:
+    """
+    Answers upstream calls from recorded responses, falling back to a fake.
+
+    Responses are matched by method and arguments; when the same call was
+    recorded several times the responses are cycled through.
+    """
+
+    def __init__(self, label, tape, fallback):
+        self._label = label
+        self._fallback = fallback
+        self._responses = {
+            key: itertools.cycle(responses)
+            for key, responses in tape.items() if key[0].startswith(f"{label}.")
+        }
+        self._lock = threading.Lock()
+        self.played = 0
+        self.missed = 0
+
+    def __getattr__(self, name):
+        target = f"{self._label}.{name}"
+        fallback = getattr(self._fallback, name)
+
+        def call(*args, **kwargs):
+            responses = self._responses.get((target, upstream_key(args, kwargs)))
+            if responses is None:
+                with self._lock:
+                    self.missed += 1
+                return fallback(*args, **kwargs)
+            with self._lock:
+                self.played += 1
+                return next(responses)
+
+        return call
+
+
+def load_capture(path):
+    """Split a capture file into request entries (by time) and an upstream tape"""
+    requests = []
+    tape = collections.defaultdict(list)
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get('type') == 'upstream':
+                tape[(entry['target'], entry['key'])].append(entry['response'])
+            elif entry.get('type') == 'request':
+                requests.append(entry)
+    requests.sort(key=lambda entry: entry['t'])
+    return requests, tape
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def replay(app, requests, speed=1.0, concurrency=32):
+    """
+    Re-issue captured requests against `app`.
+
+    speed=1 keeps the original inter-arrival times, speed=10 compresses
+    them tenfold and speed=0 sends everything as fast as the pool allows.
+
+    Returns:
+        list of result dicts with 'endpoint', 'status', 'latency_ms'
+    """
+    adapter = app.url_map.bind('localhost')
+    results = []
+    results_lock = threading.Lock()
+    local = threading.local()
+
+    def endpoint_for(entry):
+        try:
+            endpoint, _ = adapter.match(entry['path'], method=entry['method'])
+            return f"{entry['method']} {endpoint}"
+        except Exception:
+            return f"{entry['method']} {entry['path']}"
+
+    def issue(entry):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        started = time.perf_counter()
+        try:
+            response = client.open(
+                entry['path'],
+                method=entry['method'],
+                query_string=entry.get('args') or None,
+                json=entry.get('json'),
+                headers={'X-Forwarded-For': entry.get('client', 'replay')}
+            )
+            status = response.status_code
+            response.close()
+        except Exception:
+            status = 'exception'
+        latency_ms = (time.perf_counter() - started) * 1000
+        with results_lock:
+            results.append({'endpoint': endpoint_for(entry), 'status': status, 'latency_ms': latency_ms})
+
+    if not requests:
+        return results
+    origin = requests[0]['t']
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for entry in requests:
+            if speed:
+                delay = (entry['t'] - origin) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            executor.submit(issue, entry)
+    return results
+
+
+def summarize(results, elapsed):
+    """Throughput, latency percentiles and error rates per endpoint"""
+    by_endpoint = collections.defaultdict(list)
+    for result in results:
+        by_endpoint[result['endpoint']].append(result)
+    by_endpoint['ALL'] = list(results)
+
+    summary = {}
+    for endpoint, entries in sorted(by_endpoint.items()):
+        latencies = sorted(entry['latency_ms'] for entry in entries)
+        statuses = [entry['status'] for entry in entries]
+        errors = sum(1 for s in statuses if s == 'exception' or (s >= 500 and s != 503))
+        rejected = sum(1 for s in statuses if s in (429, 503))
+        summary[endpoint] = {
+            'requests': len(entries),
+            'throughput_rps': round(len(entries) / elapsed, 2) if elapsed else 0.0,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+            'error_rate': round(errors / len(entries), 4),
+            'rejected_rate': round(rejected / len(entries), 4)
+        }
+    return summary
+
+
+def build_replay_app(tape=None, upstream='fake', upstream_delay=0.0, llm_delay=0.0, cache_dir=None):
+    """create_app wired to fake or played-back upstreams and throwaway caches"""
+    from app import create_app
+    from app.config import Config
+
+    cache_dir = cache_dir or tempfile.mkdtemp(prefix='replay-')
+    fake_maps = FakeMapsClient(delay=upstream_delay)
+    fake_llm = FakeLLM(delay=llm_delay)
+    if upstream == 'recorded':
+        gmaps = PlaybackClient('gmaps', tape or {}, fake_maps)
+        llm = PlaybackClient('llm', tape or {}, fake_llm)
+    else:
+        gmaps, llm = fake_maps, fake_llm
+
+    class ReplayConfig(Config):
+        TESTING = True
+        MAIL_SUPPRESS_SEND = True
+        MAIL_DEFAULT_SENDER = 'replay@example.invalid'
+        CAPTURE_FILE = None
+        # Recorded clients are replayed as a single trusted X-Forwarded-For hop
+        TRUSTED_PROXY_HOPS = 1
+        GMAPS_CLIENT = gmaps
+        LLM_CLIENT = llm
+        PHOTO_CACHE_DIR = os.path.join(cache_dir, 'photos')
+        ITINERARY_STORE_PATH = os.path.join(cache_dir, 'itineraries.sqlite3')
+        PLACE_CATALOG_PATH = os.path.join(cache_dir, 'places.sqlite3')
+        CACHE_PATH = os.path.join(cache_dir, 'shared.sqlite3')
+
+    return create_app(ReplayConfig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay captured API traffic and report latency")
+    parser.add_argument('capture', help="JSONL file written with CAPTURE_FILE")
+    parser.add_argument('--speed', type=float, default=1.0, help="Time compression; 0 sends as fast as possible")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--upstream', choices=['fake', 'recorded'], default='fake')
+    parser.add_argument('--upstream-delay', type=float, default=0.0, help="Simulated Google Maps latency (s)")
+    parser.add_argument('--llm-delay', type=float, default=0.0, help="Simulated LLM latency (s)")
+    parser.add_argument('--cache-dir', help="Reuse caches from this directory instead of starting cold")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    requests, tape = load_capture(args.capture)
+    app = build_replay_app(tape, args.upstream, args.upstream_delay, args.llm_delay, args.cache_dir)
+
+    started = time.monotonic()
+    results = replay(app, requests, speed=args.speed, concurrency=args.concurrency)
+    summary = summarize(results, time.monotonic() - started)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+    header = f"{'endpoint':<40} {'reqs':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'err%':>6} {'rej%':>6}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, stats in summary.items():
+        print(
+            f"{endpoint:<40} {stats['requests']:>6} {stats['throughput_rps']:>8} "
+            f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats['max_ms']:>8} "
+            f"{stats['error_rate'] * 100:>6.1f} {stats['rejected_rate'] * 100:>6.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Modes whose durations depend on traffic or timetables
+TIME_SENSITIVE_MODES = {'driving', 'transit'}
+
+
+def _normalize(value):
+    return " ".join(str(value).lower().split())
+
+
+class RouteCache:
+    """
+    Cache for Directions results that tolerates departure_time=now.
+
+    Keys are the normalized origin, destination, waypoint set and mode.
+    Waypoints are requested with optimize_waypoints, so their order does
+    not change the result. Routes for driving and transit stay fresh until
+    the end of the current departure-time bucket. Walking and bicycling
+    routes stay fresh for `static_ttl`. With `stale_ttl`, an expired route
+    is still returned for that long while a single background refresh
+    replaces it.
+    """
+
+    def __init__(self, maxsize=2000, bucket_seconds=900, static_ttl=7 * 24 * 3600, stale_ttl=0, cache=None):
+        self.bucket_seconds = bucket_seconds
+        self.static_ttl = static_ttl
+        self.stale_ttl = stale_ttl
+        # Any LRUCache-compatible backend, e.g. one shared between workers
+        self._cache = cache if cache is not None else LRUCache(maxsize=maxsize)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='route-refresh')
+        self._stats = {'fresh': 0, 'stale': 0, 'fetches': 0, 'refreshes': 0, 'refresh_errors': 0}
+
+    @staticmethod
+    def key_for(origin, destination, waypoints=None, mode='walking'):
+        stops = sorted({_normalize(w) for w in waypoints or [] if w})
+        return f"route:{_normalize(mode)}|{_normalize(origin)}|{_normalize(destination)}|{'|'.join(stops)}"
+
+    def fresh_until(self, mode, now=None):
+        """Wall-clock time until which a route fetched now counts as current"""
+        now = time.time() if now is None else now
+        if _normalize(mode) in TIME_SENSITIVE_MODES:
+            return (now // self.bucket_seconds + 1) * self.bucket_seconds
+        return now + self.static_ttl
+
+    def get_or_fetch(self, origin, destination, waypoints, mode, fetch):
+        """
+        Return a cached route or call `fetch()` for a new one.
+
+        `fetch` must not depend on the request context, since it may run on
+        a background thread. Empty results are returned but not cached.
+        """
+        key = self.key_for(origin, destination, waypoints, mode)
+        entry = self._cache.get(key)
+        now = time.time()
+        if entry is not None:
+            if now < entry['fresh_until']:
+                self._count('fresh')
+                return entry['route']
+            if self.stale_ttl:
+                self._count('stale')
+                self._refresh_later(key, mode, fetch)
+                return entry['route']
+
+        self._count('fetches')
+        route = fetch()
+        self._store(key, mode, route)
+        return route
+
+    def _store(self, key, mode, route):
+        if not route:
+            return
+        fresh_until = self.fresh_until(mode)
+        ttl = fresh_until - time.time() + self.stale_ttl
+        self._cache.set(key, {'route': route, 'fresh_until': fresh_until}, ttl=ttl)
+
+    def _refresh_later(self, key, mode, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._store(key, mode, fetch())
+                self._count('refreshes')
+            except Exception as e:
+                self._count('refresh_errors')
+                logger.warning("Background route refresh failed for %s: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresher.submit(refresh)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, refreshing=len(self._refreshing))
+        stats['cache'] = self._cache.stats()
+        return stats
@@ -1,15 +1,19 @@
 from typing import List
 from firecrawl import FirecrawlApp
+import argparse
+import json
 import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pydantic import BaseModel, Field
 import time
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from app.services.admission import TokenBucket
+from app.services.cli_input import read_lines
+
 logger = logging.getLogger(__name__)
 
 class SafetyAlertSchema(BaseModel):
@@ -26,21 +30,33 @@ class SafetyAlertSchema(BaseModel):
 class SafetyMonitor:
     """Class to monitor and analyze safety alerts for locations using Firecrawl LLM Extract"""
 
-    def __init__(self, api_key: str):
-        """Initialize the SafetyMonitor"""
+    def __init__(self, api_key: str, limiter: TokenBucket = None):
+        """
+        Initialize the SafetyMonitor
+
+        Args:
+            api_key: Firecrawl API key
+            limiter: Optional TokenBucket shared by all threads; replaces the
+                fixed one-second pause between requests
+        """
         if not api_key:
             raise ValueError("Firecrawl API key is required")
         self.app = FirecrawlApp(api_key=api_key)
+        self.limiter = limiter
 
-    def fetch_safety_alerts(self, destination: str, min_alerts: int = 3) -> List[dict]:
+    def fetch_safety_alerts(self, destination: str, min_alerts: int = 3, strict: bool = False) -> List[dict]:
         """
         Fetch and extract safety alerts for a given destination using Firecrawl LLM Extract
         
         Args:
             destination: Location to check for alerts
             min_alerts: Minimum number of alerts to fetch (default: 3)
+            strict: Raise when every search term failed, instead of returning
+                an empty list that is indistinguishable from "no alerts"
         """
         alerts = []
+        attempted = 0
+        errors = []
         search_terms = [
             f"{destination} emergency alert news",
             f"{destination} safety warning",
@@ -54,6 +70,7 @@ class SafetyMonitor:
                 if len(alerts) >= min_alerts:
                     break
                     
+                attempted += 1
                 try:
                     # Add system prompt to guide extraction
                     system_prompt = """
@@ -64,6 +81,8 @@ class SafetyMonitor:
                     4. No duplicate alerts
                     """
                     
+                    if self.limiter is not None:
+                        self.limiter.acquire()
                     scrape_result = self.app.scrape_url(
                         f"https://news.google.com/search?q={search_term}",
                         {
@@ -85,24 +104,139 @@ class SafetyMonitor:
                         ):
                             alerts.append(new_alert)
                     
-                    # Brief pause between requests
-                    time.sleep(1)
+                    # Brief pause between requests unless a shared limiter paces them
+                    if self.limiter is None:
+                        time.sleep(1)
                     
                 except Exception as e:
-                    logger.warning(f"Error processing search term '{search_term}': {str(e)}")
+                    logger.warning("Error processing search term '%s': %s", search_term, e)
+                    errors.append(e)
                     continue
+
+            if strict and errors and len(errors) == attempted:
+                raise RuntimeError(
+                    f"All {attempted} searches failed for {destination}: {errors[-1]}"
+                ) from errors[-1]
                             
         except Exception as e:
-            logger.error(f"Error fetching alerts for {destination}: {str(e)}")
+            logger.error("Error fetching alerts for %s: %s", destination, e)
             raise
             
         return alerts
 
-def main(): 
+def read_completed(output_path: str) -> set:
+    """Destinations already checked successfully in a (possibly partial) JSONL output file"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if entry.get('status') == 'ok':
+                completed.add(entry['destination'])
+    return completed
+
+
+def run_batch(monitor: SafetyMonitor, destinations: List[str], output_path: str,
+              concurrency: int = 4, resume: bool = True) -> dict:
+    """
+    Check many destinations concurrently, appending one JSON line per destination.
+
+    Every result is flushed as soon as it is ready, so an interrupted run
+    loses at most the destinations in flight. With resume, destinations
+    already recorded as 'ok' in the output file are skipped; failed ones,
+    including those whose every search errored, are retried.
+
+    Returns:
+        dict with 'total', 'skipped', 'checked', 'failed', 'alerts' and 'elapsed'
+    """
+    destinations = list(dict.fromkeys(destinations))
+    completed = read_completed(output_path) if resume else set()
+    pending = [destination for destination in destinations if destination not in completed]
+    summary = {
+        'total': len(destinations), 'skipped': len(destinations) - len(pending),
+        'checked': 0, 'failed': 0, 'alerts': 0
+    }
+    write_lock = threading.Lock()
+
+    def check(destination):
+        started = time.monotonic()
+        try:
+            alerts = monitor.fetch_safety_alerts(destination, strict=True)
+            entry = {'destination': destination, 'status': 'ok', 'alerts': alerts}
+        except Exception as e:
+            entry = {'destination': destination, 'status': 'error', 'error': str(e), 'alerts': []}
+        entry['checked_at'] = datetime.now().isoformat(timespec='seconds')
+        entry['duration_s'] = round(time.monotonic() - started, 2)
+        return entry
+
+    started = time.monotonic()
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as out, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(check, destination) for destination in pending]
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                entry = future.result()
+                with write_lock:
+                    out.write(json.dumps(entry) + "\n")
+                    out.flush()
+                if entry['status'] == 'ok':
+                    summary['checked'] += 1
+                    summary['alerts'] += len(entry['alerts'])
+                else:
+                    summary['failed'] += 1
+                elapsed = time.monotonic() - started
+                logger.info("[%d/%d] %s: %s (%.2f destinations/s)", done, len(pending),
+                            entry['destination'], entry['status'], done / elapsed if elapsed else 0.0)
+        except KeyboardInterrupt:
+            # Written results are kept; a re-run with the same output resumes
+            for future in futures:
+                future.cancel()
+            raise
+    summary['elapsed'] = time.monotonic() - started
+    return summary
+
+
+def main(argv=None):
     """Main function to run the safety monitoring system"""
+    parser = argparse.ArgumentParser(description="Check destinations for recent safety alerts")
+    parser.add_argument('--batch', help="File with one destination per line, or '-' for stdin")
+    parser.add_argument('--output', default='safety_alerts.jsonl', help="JSONL results file for --batch")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=1.0, help="Maximum Firecrawl requests per second")
+    parser.add_argument('--no-resume', action='store_true', help="Overwrite the output instead of resuming")
+    parser.add_argument('--api-key', default=os.environ.get('FIRECRAWL_API_KEY'))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    if args.batch:
+        monitor = SafetyMonitor(args.api_key, limiter=TokenBucket(args.rate, capacity=1))
+        try:
+            summary = run_batch(
+                monitor, read_lines(args.batch), args.output,
+                concurrency=args.concurrency, resume=not args.no_resume
+            )
+        except KeyboardInterrupt:
+            print("\nInterrupted; re-run the same command to resume.")
+            return 130
+        rate = summary['checked'] / summary['elapsed'] if summary['elapsed'] else 0.0
+        print(
+            f"{summary['checked']} checked ({summary['alerts']} alerts), {summary['skipped']} already done, "
+            f"{summary['failed']} failed out of {summary['total']} in {summary['elapsed']:.1f}s "
+            f"({rate:.2f} destinations/s)"
+        )
+        return 1 if summary['failed'] else 0
+
     try:
-        api_key = "***"  # Replace with your API key
-        monitor = SafetyMonitor(api_key)
+        monitor = SafetyMonitor(args.api_key)
         
         while True:
             destination = input("\nEnter destination address (or 'quit' to exit): ").strip()
@@ -137,8 +271,8 @@ def main():
     except KeyboardInterrupt:
         print("\nExiting safely...")
     except Exception as e:
-        logger.error(f"An error occurred: {str(e)}")
+        logger.error("An error occurred: %s", e)
         print("An error occurred. Please check the logs for details.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,341 @@
+"""
+Cache backends shared between worker processes.
+
+Everything held on `current_app` is per process, so each Gunicorn worker
+would otherwise repeat the same geocodes, place details, routes and LLM
+calls. The backends here share the interface of LRUCache
+(get/set/delete/clear/stats):
+
+- SQLiteCache: a memory-mapped SQLite file shared by the workers of one host
+- RedisCache: any Redis-protocol server, for several hosts
+- InMemoryRedis: an in-process Redis stand-in (CACHE_REDIS_URL=memory://)
+
+Values are serialized with msgpack when it is installed, JSON otherwise.
+Backend errors are logged and treated as misses, so an unavailable cache
+never fails a request.
+"""
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is in requirements.txt
+    msgpack = None
+
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL,
+    stored_at REAL NOT NULL
+)
+"""
+
+
+def pack(value):
+    """Serialize a value; the first byte records the format"""
+    if msgpack is not None:
+        return b'm' + msgpack.packb(value, use_bin_type=True, default=str)
+    return b'j' + json.dumps(value, separators=(',', ':'), default=str).encode()
+
+
+def unpack(data):
+    data = bytes(data)
+    if data[:1] == b'm':
+        return msgpack.unpackb(data[1:], raw=False)
+    return json.loads(data[1:].decode())
+
+
+class _BackendStats:
+    """Hit/miss/error counters shared by the backends"""
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'sets': 0, 'errors': 0, 'oversized': 0}
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _stats_snapshot(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+class SQLiteCache(_BackendStats):
+    """
+    Single-host cache in a WAL-mode SQLite file read through mmap.
+
+    Expired entries are ignored on read. Every EVICT_EVERY writes, expired
+    entries are purged and the oldest entries beyond `max_entries` are
+    dropped.
+    """
+
+    EVICT_EVERY = 200
+
+    def __init__(self, path, max_entries=100000, max_value_bytes=1 << 20, mmap_size=256 << 20):
+        super().__init__()
+        self.path = os.path.abspath(path)
+        self.max_entries = max_entries
+        self.max_value_bytes = max_value_bytes
+        self.mmap_size = mmap_size
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at)")
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads; keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= time.time()):
+                self._count('misses')
+                return default
+            value = unpack(row[0])
+        except Exception as e:
+            self._count('errors')
+            logger.warning("Shared cache read failed: %s", e)
+            return default
+        self._count('hits')
+        return value
+
+    def set(self, key, value, ttl=None):
+        try:
+            data = pack(value)
+            if len(data) > self.max_value_bytes:
+                self._count('oversized')
+                return
+            now = time.time()
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                    (key, sqlite3.Binary(data), now + ttl if ttl else None, now)
+                )
+            self._count('sets')
+            with self._stats_lock:
+                self._writes += 1
+                evict = self._writes % self.EVICT_EVERY == 0
+            if evict:
+                self.evict()
+        except Exception as e:
+            self._count('errors')
+            logger.warning("Shared cache write failed: %s", e)
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones beyond max_entries"""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+            excess = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY stored_at LIMIT ?)",
+                    (excess,)
+                )
+
+    def delete(self, key):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self):
+        stats = self._stats_snapshot()
+        stats.update(backend='sqlite', size=len(self), max_entries=self.max_entries)
+        return stats
+
+
+class InMemoryRedis:
+    """Minimal in-process stand-in for the redis-py client commands RedisCache uses"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, name):
+        entry = self._data.get(name)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry
+
+    def ping(self):
+        return True
+
+    def get(self, name):
+        with self._lock:
+            entry = self._live(name)
+            return entry[0] if entry else None
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = (bytes(value), time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            names = [name for name in list(self._data) if self._live(name)]
+        return iter([name for name in names if fnmatch.fnmatchcase(name, match)])
+
+    def dbsize(self):
+        with self._lock:
+            return sum(1 for name in list(self._data) if self._live(name))
+
+
+class RedisCache(_BackendStats):
+    """
+    Cache on a Redis-protocol server, shared across hosts.
+
+    Keys are namespaced with `prefix`. Entry count is bounded by the
+    server's maxmemory policy; values above `max_value_bytes` are skipped.
+    """
+
+    def __init__(self, client, prefix='travelguide:', max_value_bytes=1 << 20):
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.max_value_bytes = max_value_bytes
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        if url.startswith('memory://'):
+            return cls(InMemoryRedis(), **kwargs)
+        import redis
+        return cls(redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1), **kwargs)
+
+    def get(self, key, default=None):
+        try:
+            data = self.client.get(self.prefix + key)
+            if data is None:
+                self._count('misses')
+                return default
+            value = unpack(data)
+        except Exception as e:
+            self._count('errors')
+            logger.warning("Shared cache read failed: %s", e)
+            return default
+        self._count('hits')
+        return value
+
+    def set(self, key, value, ttl=None):
+        try:
+            data = pack(value)
+            if len(data) > self.max_value_bytes:
+                self._count('oversized')
+                return
+            # Redis expiries are whole seconds
+            self.client.set(self.prefix + key, data, ex=max(1, int(ttl)) if ttl else None)
+            self._count('sets')
+        except Exception as e:
+            self._count('errors')
+            logger.warning("Shared cache write failed: %s", e)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        names = list(self.client.scan_iter(match=self.prefix + '*'))
+        if names:
+            self.client.delete(*names)
+
+    def stats(self):
+        stats = self._stats_snapshot()
+        stats['backend'] = 'redis'
+        return stats
+
+
+class CachedClient:
+    """
+    Proxy caching the results of selected client methods in a shared backend.
+
+    `ttls` maps method names to TTLs in seconds; other attributes pass
+    through. Keys hash the method arguments. Empty results and exceptions
+    are not cached. Dict results served from the cache carry `cached: True`,
+    and a recorded `latency_ms` is replaced by the time the lookup took.
+    """
+
+    def __init__(self, client, label, cache, ttls):
+        self._client = client
+        self._label = label
+        self._cache = cache
+        self._ttls = dict(ttls)
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in self._ttls or not callable(attr):
+            return attr
+        ttl = self._ttls[name]
+        prefix = f"{self._label}.{name}:"
+
+        def call(*args, **kwargs):
+            raw = json.dumps([args, kwargs], sort_keys=True, default=str)
+            key = prefix + hashlib.sha256(raw.encode()).hexdigest()[:32]
+            started = time.perf_counter()
+            cached = self._cache.get(key)
+            if cached is not None:
+                if isinstance(cached, dict):
+                    # The memory backend hands out its stored dict; annotate a copy
+                    cached = dict(cached, cached=True)
+                    if 'latency_ms' in cached:
+                        cached['latency_ms'] = (time.perf_counter() - started) * 1000
+                return cached
+            result = attr(*args, **kwargs)
+            if result:
+                self._cache.set(key, result, ttl=ttl)
+            return result
+
+        self.__dict__[name] = call
+        return call
+
+
+def create_cache_backend(config):
+    """Build the shared cache selected by CACHE_BACKEND (memory, sqlite or redis)"""
+    backend = (config.get('CACHE_BACKEND') or 'sqlite').lower()
+    max_value_bytes = config.get('CACHE_MAX_VALUE_BYTES', 1 << 20)
+    if backend == 'redis':
+        return RedisCache.from_url(
+            config.get('CACHE_REDIS_URL') or 'redis://localhost:6379/0',
+            prefix=config.get('CACHE_KEY_PREFIX', 'travelguide:'),
+            max_value_bytes=max_value_bytes
+        )
+    if backend == 'sqlite':
+        return SQLiteCache(
+            config.get('CACHE_PATH') or 'cache/shared.sqlite3',
+            max_entries=config.get('CACHE_MAX_ENTRIES', 100000),
+            max_value_bytes=max_value_bytes
+        )
+    if backend == 'memory':
+        return LRUCache(maxsize=config.get('CACHE_MAX_ENTRIES', 100000))
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
@@ -1,8 +1,9 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, send_file, url_for
 from googlemaps import Client
 from google.cloud import translate_v2 as translate
 import os
 from dotenv import load_dotenv
+from app.services.photo_cache import PhotoCache
 
 # Load environment variables
 load_dotenv()
@@ -12,6 +13,7 @@ app = Flask(__name__, template_folder='app/templates')
 # Configure Google Maps API
 GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
 gmaps = Client(key=GOOGLE_MAPS_API_KEY)
+photo_cache = PhotoCache(gmaps, os.getenv('PHOTO_CACHE_DIR', 'cache/photos'))
 
 # Initialize Google Cloud Translation API
 translate_client = translate.Client()
@@ -68,8 +70,11 @@ class TravelGuide:
                     # Get the first photo (if available)
                     photos = details.get('photos', [])
                     if photos:
-                        photo_reference = photos[0].get('photo_reference')
-                        photo_url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={photo_reference}&key={GOOGLE_MAPS_API_KEY}"
+                        photo_url = url_for(
+                            'get_photo',
+                            photo_reference=photos[0].get('photo_reference'),
+                            w=photo_cache.variant_width(400)
+                        )
                 except Exception as e:
                     print(f"Could not get details for place_id={place_id}: {e}")
             
@@ -143,6 +148,22 @@ def search_places():
     places = travel_guide.search_places(location, place_type)
     return jsonify({'places': places})
 
+@app.route('/photo/<photo_reference>')
+def get_photo(photo_reference):
+    """Serve a cached place photo without exposing the API key"""
+    try:
+        cached = photo_cache.get(photo_reference, request.args.get('w', type=int))
+    except Exception as e:
+        print(f"Error fetching photo: {e}")
+        return jsonify({'error': 'Could not fetch photo'}), 502
+    if not cached:
+        return jsonify({'error': 'Photo not found'}), 404
+    path, blob_name = cached
+    response = send_file(path, etag=blob_name.split('.')[0], max_age=31536000, conditional=True)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 @app.route('/get_route')
 def get_route():
     """API endpoint to get a route"""
@@ -0,0 +1,26 @@
+"""
+Gunicorn settings, picked up automatically by `gunicorn wsgi:app`.
+
+Admission control gates are per worker process. Threaded workers let one
+process run GENERATE_MAX_CONCURRENCY guide generations and still have
+READ_MAX_CONCURRENCY threads free for the read endpoints, which a
+single-threaded sync worker cannot do.
+"""
+import os
+
+from app.config import Config
+
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get(
+    'GUNICORN_THREADS',
+    Config.GENERATE_MAX_CONCURRENCY + Config.READ_MAX_CONCURRENCY
+))
+# Guide generation waits on the LLM for well over gunicorn's 30 s default
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+if threads <= Config.GENERATE_MAX_CONCURRENCY:
+    raise RuntimeError(
+        f"GUNICORN_THREADS ({threads}) must exceed GENERATE_MAX_CONCURRENCY "
+        f"({Config.GENERATE_MAX_CONCURRENCY}) so read requests are not starved"
+    )
@@ -0,0 +1,32 @@
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.services.llm import FakeLLM
+from app.services.replay import FakeMapsClient
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build an app wired to offline fakes and throwaway caches; keyword args override config"""
+    def make(maps=None, llm=None, **overrides):
+        settings = dict(
+            TESTING=True,
+            MAIL_SUPPRESS_SEND=True,
+            MAIL_DEFAULT_SENDER='tests@example.invalid',
+            GMAPS_CLIENT=maps or FakeMapsClient(),
+            LLM_CLIENT=llm or FakeLLM(),
+            PHOTO_CACHE_DIR=str(tmp_path / 'photos'),
+            ITINERARY_STORE_PATH=str(tmp_path / 'itineraries.sqlite3'),
+            PLACE_CATALOG_PATH=str(tmp_path / 'places.sqlite3'),
+            CACHE_PATH=str(tmp_path / 'shared.sqlite3'),
+            CAPTURE_FILE=None
+        )
+        settings.update(overrides)
+        return create_app(type('TestConfig', (Config,), settings))
+    return make
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app().test_client()
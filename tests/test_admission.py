@@ -0,0 +1,106 @@
+import os
+import runpy
+import threading
+import time
+
+from app.config import Config
+from app.services.admission import AdmissionController, ConcurrencyGate, TokenBucket
+from app.services.llm import FakeLLM
+
+
+def test_token_bucket_allows_burst_then_reports_wait():
+    bucket = TokenBucket(rate=1, capacity=2)
+
+    assert bucket.try_acquire() == (True, 0.0)
+    assert bucket.try_acquire() == (True, 0.0)
+    allowed, wait = bucket.try_acquire()
+    assert not allowed
+    assert 0 < wait <= 1
+
+
+def test_concurrency_gate_refuses_when_queue_is_full():
+    gate = ConcurrencyGate(max_concurrent=1, max_queue=0)
+
+    assert gate.acquire()
+    assert not gate.acquire()
+    gate.release()
+    assert gate.acquire()
+
+
+def test_concurrency_gate_admits_queued_caller_on_release():
+    gate = ConcurrencyGate(max_concurrent=1, max_queue=1, queue_timeout=2)
+    gate.acquire()
+    admitted = []
+    waiter = threading.Thread(target=lambda: admitted.append(gate.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    gate.release()
+    waiter.join()
+
+    assert admitted == [True]
+
+
+def test_controller_rate_limits_per_client():
+    controller = AdmissionController('read', rate=1, burst=1)
+
+    assert controller.enter('a') is None
+    status, retry_after, _ = controller.enter('a')
+    assert status == 429
+    assert retry_after > 0
+    assert controller.enter('b') is None
+
+
+def test_read_endpoint_returns_429_with_retry_after(make_app):
+    client = make_app(READ_RATE_LIMIT=0.1, READ_BURST=2).test_client()
+
+    statuses = [client.get('/api/route?origin=a&destination=b').status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+    response = client.get('/api/route?origin=a&destination=b')
+    assert response.json['success'] is False
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_rate_limit_ignores_spoofed_forwarded_for(make_app):
+    client = make_app(READ_RATE_LIMIT=0.1, READ_BURST=1, TRUSTED_PROXY_HOPS=1).test_client()
+
+    statuses = [
+        client.get('/api/route?origin=a&destination=b',
+                   headers={'X-Forwarded-For': f'10.0.0.{i}, 203.0.113.7'}).status_code
+        for i in range(3)
+    ]
+
+    assert statuses == [200, 429, 429]
+
+
+def test_generate_endpoint_returns_503_when_saturated(make_app):
+    app = make_app(llm=FakeLLM(delay=0.5), GENERATE_MAX_CONCURRENCY=1, GENERATE_MAX_QUEUE=0,
+                   GENERATE_RATE_LIMIT=100, GENERATE_BURST=100)
+    body = {'destination': 'Rome', 'budget': 'Budget', 'travelers': 2, 'email': 'a@example.invalid'}
+    first = []
+    slow = threading.Thread(
+        target=lambda: first.append(app.test_client().post('/api/generate-travel-guide', json=body).status_code)
+    )
+    slow.start()
+    time.sleep(0.1)
+    response = app.test_client().post('/api/generate-travel-guide', json=body)
+    slow.join()
+
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+    assert first == [200]
+
+
+def test_photo_endpoint_is_rate_limited(make_app):
+    client = make_app(READ_RATE_LIMIT=0.1, READ_BURST=1).test_client()
+
+    statuses = [client.get(f'/api/photo/ref-{i:010d}').status_code for i in range(2)]
+
+    assert statuses == [200, 429]
+
+
+def test_gunicorn_leaves_threads_for_reads():
+    settings = runpy.run_path(os.path.join(os.path.dirname(__file__), '..', 'gunicorn.conf.py'))
+
+    assert settings['worker_class'] == 'gthread'
+    assert settings['threads'] >= Config.GENERATE_MAX_CONCURRENCY + Config.READ_MAX_CONCURRENCY
@@ -0,0 +1,49 @@
+import hashlib
+import json
+
+from app.services.capture import TrafficRecorder, pseudonym, sanitize_payload
+
+
+def read_requests(path):
+    with open(path, encoding='utf-8') as f:
+        return [entry for entry in map(json.loads, f) if entry['type'] == 'request']
+
+
+def test_placeholders_are_stable_per_secret_only():
+    body = {'email': 'ana@example.com', 'special_requests': 'wheelchair access', 'budget': 'Budget'}
+
+    first = sanitize_payload(body, b'one')
+
+    assert first == sanitize_payload(body, b'one')
+    assert first['email'] != sanitize_payload(body, b'two')['email']
+    assert first['special_requests'] == 'redacted request'
+    assert first['budget'] == 'Budget'
+
+
+def test_captured_identities_are_not_plain_hashes(make_app, tmp_path):
+    capture = tmp_path / 'capture.jsonl'
+    client = make_app(CAPTURE_FILE=str(capture)).test_client()
+    body = {'destination': 'Rome', 'budget': 'Budget', 'travelers': 2, 'email': 'ana@example.com'}
+    client.post('/api/generate-travel-guide', json=body)
+    client.post('/api/generate-travel-guide', json=body)
+
+    entries = read_requests(capture)
+    text = capture.read_text()
+
+    assert len(entries) == 2
+    assert entries[0]['json']['email'] == entries[1]['json']['email']
+    assert entries[0]['client'] == entries[1]['client']
+    for plain in ('ana@example.com', '127.0.0.1'):
+        assert plain not in text
+        assert hashlib.sha256(plain.encode()).hexdigest()[:12] not in text
+
+
+def test_configured_secret_keeps_pseudonyms_across_captures(tmp_path):
+    first = TrafficRecorder(str(tmp_path / 'a.jsonl'), secret='shared')
+    second = TrafficRecorder(str(tmp_path / 'b.jsonl'), secret='shared')
+    random_key = TrafficRecorder(str(tmp_path / 'c.jsonl'))
+
+    assert pseudonym(first._secret, '10.0.0.1') == pseudonym(second._secret, '10.0.0.1')
+    assert pseudonym(random_key._secret, '10.0.0.1') != pseudonym(first._secret, '10.0.0.1')
+    for recorder in (first, second, random_key):
+        recorder.close()
@@ -0,0 +1,88 @@
+import re
+import threading
+import time
+
+import pytest
+
+from app.services.itinerary import _strip_day_heading, generate_itinerary_parallel, parse_skeleton
+from app.services.place_resolver import parse_itinerary
+
+
+class ScriptedLLM:
+    """Answers skeleton, day and tips prompts like the real model, echoing dated day headings"""
+
+    def __init__(self, failing_days=(), fail_tips=False):
+        self.failing_days = set(failing_days)
+        self.fail_tips = fail_tips
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def complete(self, prompt, **kwargs):
+        with self._lock:
+            self.prompts.append(prompt)
+        if prompt.startswith('Outline'):
+            days = int(re.search(r'(\d+)-day', prompt).group(1))
+            text = "\n".join(f"Day {day}: Theme {day} - Area {day}" for day in range(1, days + 1))
+        elif 'Practical Tips' in prompt:
+            if self.fail_tips:
+                raise RuntimeError('tips timed out')
+            text = "## Practical Tips\n- Buy a transit pass"
+        else:
+            heading = re.search(r'Write only (Day (\d+)[^.]*)\.', prompt)
+            day = int(heading.group(2))
+            if day in self.failing_days:
+                raise RuntimeError(f'day {day} timed out')
+            # Later days answer first, so the merge cannot rely on completion order
+            time.sleep(0.02 * (5 - day))
+            text = f"## {heading.group(1)}\n- Visit **Sight {day}**"
+        return {'text': text, 'prompt_tokens': 10, 'completion_tokens': 20, 'latency_ms': 5.0}
+
+
+def generate(llm, days=4, start_date='2025-01-01'):
+    return generate_itinerary_parallel(
+        llm, 'Rome', days, 2, start_date, 'Not specified', 'Moderate', 'history', 'None', max_parallel=4
+    )
+
+
+def test_parse_skeleton_fills_missing_days():
+    text = "Day 1: Old town - Centre\n**Day 3:** Museums\nnoise\nDay 9: out of range"
+
+    assert parse_skeleton(text, 3) == ['Old town - Centre', 'Free day to explore', 'Museums']
+
+
+@pytest.mark.parametrize('heading', [
+    '## Day 3: Museums',
+    '## Day 3 (Friday 2025-01-03): Museums',
+    '**Day 3 (Friday 2025-01-03):** Museums',
+    '**Day 3**: Museums'
+])
+def test_echoed_day_heading_is_stripped(heading):
+    assert _strip_day_heading(f"{heading}\n- Visit **Sight 3**") == "- Visit **Sight 3**"
+
+
+def test_sections_merge_in_day_order_with_one_heading_each():
+    llm = ScriptedLLM()
+
+    markdown, stats = generate(llm)
+
+    days = parse_itinerary(markdown)
+    assert [day['day'] for day in days] == [1, 2, 3, 4]
+    assert [day['stops'] for day in days] == [[{'name': f"Sight {n}"}] for n in range(1, 5)]
+    assert markdown.count('(Friday') == 0
+    assert markdown.endswith("## Practical Tips\n- Buy a transit pass")
+    assert 'Write only Day 3 (Friday 2025-01-03): Theme 3 - Area 3.' in "\n".join(llm.prompts)
+    assert stats['mode'] == 'parallel'
+    assert [stage['day'] for stage in stats['stages']['days']] == [1, 2, 3, 4]
+    assert stats['prompt_tokens'] == 10 * 6
+
+
+def test_failed_day_and_tips_fall_back_without_losing_other_days():
+    markdown, stats = generate(ScriptedLLM(failing_days={2}, fail_tips=True))
+
+    days = parse_itinerary(markdown)
+    assert [day['day'] for day in days] == [1, 2, 3, 4]
+    assert days[1]['title'] == 'Theme 2 - Area 2'
+    assert 'A free day to explore Rome at your own pace.' in markdown
+    assert days[2]['stops'] == [{'name': 'Sight 3'}]
+    assert stats['stages']['days'][1] == {'day': 2, 'error': 'day 2 timed out'}
+    assert stats['stages']['tips'] == {'error': 'tips timed out'}
@@ -0,0 +1,83 @@
+import threading
+import time
+
+from app.services.photo_cache import PNG_SIGNATURE, PhotoCache
+
+
+class CountingPhotos:
+    def __init__(self, delay=0.0, body=b'\xff\xd8\xff\xe0jpeg\xff\xd9'):
+        self.calls = []
+        self.delay = delay
+        self.body = body
+        self._lock = threading.Lock()
+
+    def places_photo(self, photo_reference, max_width=None, **kwargs):
+        with self._lock:
+            self.calls.append((photo_reference, max_width))
+        time.sleep(self.delay)
+        yield self.body
+
+
+def test_concurrent_misses_fetch_once(tmp_path):
+    upstream = CountingPhotos(delay=0.2)
+    cache = PhotoCache(upstream, str(tmp_path))
+    results = []
+
+    def fetch():
+        results.append(cache.get('ref-1234567890', 400))
+
+    threads = [threading.Thread(target=fetch) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert upstream.calls == [('ref-1234567890', 400)]
+    assert results[0] == results[1]
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+
+def test_widths_snap_to_configured_variants(tmp_path):
+    upstream = CountingPhotos()
+    cache = PhotoCache(upstream, str(tmp_path), widths=(200, 400, 800))
+
+    assert cache.variant_width(None) == 400
+    assert cache.variant_width(150) == 200
+    assert cache.variant_width(401) == 800
+    assert cache.variant_width(5000) == 800
+
+    cache.get('ref-1234567890', 350)
+    cache.get('ref-1234567890', 400)
+    assert upstream.calls == [('ref-1234567890', 400)]
+
+
+def test_same_bytes_are_stored_once(tmp_path):
+    cache = PhotoCache(CountingPhotos(body=PNG_SIGNATURE + b'png'), str(tmp_path))
+
+    first = cache.get('ref-aaaaaaaaaa', 200)
+    second = cache.get('ref-bbbbbbbbbb', 200)
+
+    assert first == second
+    assert first[1].endswith('.png')
+
+
+def test_invalid_reference_is_rejected(make_app):
+    upstream = CountingPhotos()
+    app = make_app()
+    app.photo_cache.client = upstream
+
+    response = app.test_client().get('/api/photo/bad$ref')
+
+    assert response.status_code == 400
+    assert upstream.calls == []
+
+
+def test_photo_endpoint_serves_cached_variant(client):
+    first = client.get('/api/photo/ref-1234567890?w=300')
+    second = client.get('/api/photo/ref-1234567890?w=400', headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.status_code == 200
+    assert first.headers['Content-Type'] == 'image/jpeg'
+    assert second.status_code == 304
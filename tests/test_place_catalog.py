@@ -0,0 +1,72 @@
+import sqlite3
+
+import pytest
+
+from app.services.place_catalog import PlaceCatalog
+
+
+def place(place_id, name, lat, lng, types):
+    return {
+        'place_id': place_id, 'name': name, 'address': f"{name} street",
+        'location': {'lat': lat, 'lng': lng}, 'rating': 4.5, 'types': types,
+        'description': f"About {name}"
+    }
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = PlaceCatalog(str(tmp_path / 'places.sqlite3'), max_age=3600)
+    city = catalog.add_city('Paris', 48.8566, 2.3522, aliases=['Paris, France'], radius=5000)
+    catalog.upsert_places(city, [
+        place('louvre', 'Louvre', 48.8606, 2.3376, ['museum', 'point_of_interest']),
+        place('orsay', "Musee d'Orsay", 48.8600, 2.3266, ['museum']),
+        place('versailles', 'Versailles', 48.8049, 2.1204, ['museum']),
+        place('luxembourg', 'Jardin du Luxembourg', 48.8462, 2.3372, ['park'])
+    ])
+    return catalog
+
+
+def test_search_by_type_and_radius(catalog):
+    places = catalog.search('paris, france', 'museum', 5000)
+
+    assert {p['place_id'] for p in places} == {'louvre', 'orsay'}
+
+
+def test_search_by_text(catalog):
+    places = catalog.search('Paris', query='jardin')
+
+    assert [p['place_id'] for p in places] == ['luxembourg']
+
+
+def test_unknown_city_or_type_goes_upstream(catalog):
+    assert catalog.search('Lyon', 'museum', 5000) is None
+    assert catalog.search('Paris', 'restaurant', 5000) is None
+
+
+def test_radius_beyond_import_goes_upstream(catalog):
+    assert catalog.search('Paris', 'museum', 50000) is None
+
+
+def test_stale_rows_go_upstream_until_refreshed(catalog):
+    conn = catalog._connection()
+    with conn:
+        conn.execute("UPDATE cities SET imported_at = 0")
+        conn.execute("UPDATE places SET fetched_at = 0")
+    assert catalog.search('Paris', 'park', 5000) is None
+
+    catalog.upsert_places('paris', [place('luxembourg', 'Jardin du Luxembourg', 48.8462, 2.3372, ['park'])])
+
+    assert [p['place_id'] for p in catalog.search('Paris', 'park', 5000)] == ['luxembourg']
+
+
+def test_failed_write_back_still_returns_upstream_results(make_app):
+    app = make_app()
+    app.place_catalog.add_city('Oslo', 59.91, 10.75)
+
+    def locked(city_key, places):
+        raise sqlite3.OperationalError('database is locked')
+    app.place_catalog.upsert_places = locked
+
+    body = app.test_client().get('/api/search_places?location=Oslo&type=museum').json
+
+    assert body['count'] == 20
@@ -0,0 +1,96 @@
+import collections
+import threading
+
+from app.services.place_resolver import PlaceResolver, parse_itinerary
+
+ITINERARY = """Here's your trip!
+
+## Day 1: Old Town
+- **Morning:** Visit the **Colosseum** and the **Roman Forum**
+- **Lunch:** Pizza at **Da Remo**
+- **Cost:** about 20 EUR
+
+**Day 2 - Vatican**
+- See the **Vatican Museums**, then back to the **Colosseum** at night
+- **Tip:** book ahead
+
+## Practical Tips
+- Buy a **Roma Pass**
+"""
+
+
+class CountingFinder:
+    def __init__(self, unknown=(), failing=()):
+        self.queries = collections.Counter()
+        self.unknown = set(unknown)
+        self.failing = set(failing)
+        self._lock = threading.Lock()
+
+    def find_place(self, input, input_type, **kwargs):
+        with self._lock:
+            self.queries[input] += 1
+        name = input.split(',')[0]
+        if name in self.failing:
+            raise RuntimeError('OVER_QUERY_LIMIT')
+        if name in self.unknown:
+            return {'candidates': []}
+        return {'candidates': [{
+            'place_id': f"id-{name}",
+            'geometry': {'location': {'lat': 41.9, 'lng': 12.5}},
+            'formatted_address': f"{name}, Rome"
+        }]}
+
+
+def test_parse_itinerary_extracts_days_and_bold_places():
+    days = parse_itinerary(ITINERARY)
+
+    assert [(day['day'], day['title']) for day in days] == [(1, 'Old Town'), (2, 'Vatican')]
+    assert [stop['name'] for stop in days[0]['stops']] == ['Colosseum', 'Roman Forum', 'Da Remo']
+    # Labels are skipped; text under a later non-day heading is not a stop of day 2
+    assert [stop['name'] for stop in days[1]['stops']] == ['Vatican Museums', 'Colosseum']
+
+
+def test_parse_itinerary_without_days_is_empty():
+    assert parse_itinerary("Just **Rome**, no plan") == []
+    assert parse_itinerary(None) == []
+
+
+def test_resolve_looks_up_each_name_once_per_batch():
+    finder = CountingFinder()
+    resolver = PlaceResolver(finder)
+
+    places = resolver.resolve(['Colosseum', 'colosseum ', 'Da Remo'], 'Rome')
+
+    assert places['Colosseum'] == places['colosseum '] == {
+        'place_id': 'id-Colosseum', 'location': {'lat': 41.9, 'lng': 12.5}, 'address': 'Colosseum, Rome'
+    }
+    assert sum(finder.queries.values()) == 2
+
+
+def test_resolve_caches_hits_and_misses_but_not_errors():
+    finder = CountingFinder(unknown={'Da Remo'}, failing={'Roma Pass'})
+    resolver = PlaceResolver(finder)
+
+    first = resolver.resolve(['Colosseum', 'Da Remo', 'Roma Pass'], 'Rome')
+    second = resolver.resolve(['Colosseum', 'Da Remo', 'Roma Pass'], 'Rome')
+
+    assert first == second
+    assert first['Da Remo'] == {} and first['Roma Pass'] == {}
+    assert finder.queries == {'Colosseum, Rome': 1, 'Da Remo, Rome': 1, 'Roma Pass, Rome': 2}
+
+
+def test_structure_attaches_places_to_every_stop():
+    finder = CountingFinder()
+
+    structured = PlaceResolver(finder).structure(ITINERARY, 'Rome')
+
+    stops = [stop for day in structured['days'] for stop in day['stops']]
+    assert all(stop['place_id'] == f"id-{stop['name']}" for stop in stops)
+    # Colosseum appears on both days but is looked up once
+    assert finder.queries['Colosseum, Rome'] == 1
+
+
+def test_sub_headings_stay_inside_their_day():
+    days = parse_itinerary("## Day 1: Rome\n### Morning\n- **Pantheon**\n### Evening\n- **Trastevere**")
+
+    assert [stop['name'] for stop in days[0]['stops']] == ['Pantheon', 'Trastevere']
@@ -0,0 +1,39 @@
+from app.services.itinerary_store import ItineraryStore
+from app.services.llm import FakeLLM
+from app.services.pregenerate import pregenerate
+
+
+def test_pregenerate_stores_every_combination(tmp_path):
+    store = ItineraryStore(str(tmp_path / 'itineraries.sqlite3'))
+    llm = FakeLLM()
+
+    summary = pregenerate(llm, store, ['Rome', 'Kyoto'], [3, 5], ['Budget', 'Luxury'], rate=1000)
+
+    assert summary['total'] == 8
+    assert summary['generated'] == 8
+    assert summary['skipped'] == 0
+    assert len(store) == 8
+    assert llm.calls == 8
+    stored = store.get('Rome', 3, 2, 'Budget', 'General sightseeing')
+    assert '## Day 3' in stored['itinerary']
+
+
+def test_pregenerate_resumes_and_skips_stored(tmp_path):
+    store = ItineraryStore(str(tmp_path / 'itineraries.sqlite3'))
+    pregenerate(FakeLLM(), store, ['Rome'], [3], ['Budget'], rate=1000)
+
+    llm = FakeLLM()
+    summary = pregenerate(llm, store, ['Rome', 'Kyoto'], [3], ['Budget'], rate=1000)
+
+    assert summary['skipped'] == 1
+    assert summary['generated'] == 1
+    assert llm.calls == 1
+    assert len(store) == 2
+
+
+def test_stored_itinerary_is_keyed_on_party_size(tmp_path):
+    store = ItineraryStore(str(tmp_path / 'itineraries.sqlite3'))
+    pregenerate(FakeLLM(), store, ['Rome'], [3], ['Budget'], travelers=2, rate=1000)
+
+    assert store.get('rome', 3, 2, 'budget', 'General sightseeing') is not None
+    assert store.get('Rome', 3, 4, 'Budget', 'General sightseeing') is None
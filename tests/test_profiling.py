@@ -0,0 +1,29 @@
+import pytest
+
+ADMIN = {'X-Admin-Token': 'admin-secret'}
+
+
+@pytest.fixture
+def admin_client(make_app):
+    return make_app(ADMIN_TOKEN='admin-secret').test_client()
+
+
+def test_sample_rate_is_clamped(admin_client):
+    response = admin_client.post('/api/admin/profiling', json={'sample_rate': '2'}, headers=ADMIN)
+
+    assert response.status_code == 200
+    assert response.json['sample_rate'] == 1.0
+
+
+@pytest.mark.parametrize('value', ['often', None, [0.5], 'nan'])
+def test_invalid_sample_rate_is_rejected(admin_client, value):
+    before = admin_client.get('/api/admin/profiling', headers=ADMIN).json['sample_rate']
+
+    response = admin_client.post('/api/admin/profiling', json={'sample_rate': value}, headers=ADMIN)
+
+    assert response.status_code == 400
+    assert admin_client.get('/api/admin/profiling', headers=ADMIN).json['sample_rate'] == before
+
+
+def test_profiling_endpoints_hidden_without_admin_token(client):
+    assert client.get('/api/admin/profiling').status_code == 404
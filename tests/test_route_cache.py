@@ -0,0 +1,86 @@
+import threading
+import time
+
+from app.services.route_cache import RouteCache
+
+
+class CountingFetch:
+    def __init__(self, name='route', delay=0.0):
+        self.name = name
+        self.calls = 0
+        self.delay = delay
+        self.done = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        self.done.set()
+        return {'route': f"{self.name}-{self.calls}"}
+
+
+def test_key_ignores_waypoint_order_and_case():
+    assert RouteCache.key_for('A', 'B', ['x', 'Y'], 'walking') == RouteCache.key_for(' a', 'b ', ['y', 'X'], 'Walking')
+    assert RouteCache.key_for('A', 'B', [], 'walking') != RouteCache.key_for('A', 'B', [], 'driving')
+
+
+def test_fresh_route_is_served_from_cache():
+    cache = RouteCache()
+    fetch = CountingFetch()
+
+    first = cache.get_or_fetch('A', 'B', ['x'], 'walking', fetch)
+    second = cache.get_or_fetch('A', 'B', ['x'], 'walking', fetch)
+
+    assert first == second == {'route': 'route-1'}
+    assert fetch.calls == 1
+    assert cache.stats()['fresh'] == 1
+
+
+def test_traffic_modes_expire_at_bucket_boundary():
+    cache = RouteCache(bucket_seconds=900)
+
+    assert cache.fresh_until('driving', now=1000) == 1800
+    assert cache.fresh_until('transit', now=1799) == 1800
+    assert cache.fresh_until('walking', now=1000) == 1000 + cache.static_ttl
+
+
+def test_expired_route_is_refetched_without_stale_window():
+    cache = RouteCache(bucket_seconds=1)
+    fetch = CountingFetch()
+    cache.get_or_fetch('A', 'B', None, 'driving', fetch)
+    time.sleep(1.05)
+
+    assert cache.get_or_fetch('A', 'B', None, 'driving', fetch) == {'route': 'route-2'}
+    assert fetch.calls == 2
+
+
+def test_stale_route_is_served_while_one_refresh_runs():
+    cache = RouteCache(bucket_seconds=1, stale_ttl=30)
+    cache.get_or_fetch('A', 'B', None, 'driving', CountingFetch('old'))
+    time.sleep(1.05)
+    # Keep the refreshed entry fresh for the rest of the test
+    cache.bucket_seconds = 3600
+
+    refresh = CountingFetch('new', delay=0.1)
+    stale = [cache.get_or_fetch('A', 'B', None, 'driving', refresh) for _ in range(5)]
+    assert refresh.done.wait(2)
+    time.sleep(0.05)
+
+    assert stale == [{'route': 'old-1'}] * 5
+    assert refresh.calls == 1
+    assert cache.get_or_fetch('A', 'B', None, 'driving', refresh) == {'route': 'new-1'}
+    stats = cache.stats()
+    assert stats['stale'] == 5
+    assert stats['refreshes'] == 1
+
+
+def test_empty_results_are_not_cached():
+    cache = RouteCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {}
+
+    cache.get_or_fetch('A', 'B', None, 'walking', fetch)
+    cache.get_or_fetch('A', 'B', None, 'walking', fetch)
+    assert len(calls) == 2
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from app.services.admission import TokenBucket
+
+pytest.importorskip('firecrawl')
+
+from app.services.safety_monitor_news import SafetyMonitor, read_completed, run_batch  # noqa: E402
+
+
+class FlakyMonitor:
+    """Fails each destination in `failing` on its first check only"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.checked = []
+
+    def fetch_safety_alerts(self, destination, min_alerts=3, strict=False):
+        self.checked.append(destination)
+        if destination in self.failing:
+            self.failing.discard(destination)
+            raise RuntimeError('rate limited')
+        return [{'dangerous_news_and_safety_alert': f"Alert in {destination}", 'date': 'today', 'link': 'x'}]
+
+
+class FailingScraper:
+    def __init__(self):
+        self.calls = 0
+
+    def scrape_url(self, url, params):
+        self.calls += 1
+        raise RuntimeError('402 quota exceeded')
+
+
+def read_entries(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_failed_destination_is_retried_on_rerun(tmp_path):
+    output = str(tmp_path / 'alerts.jsonl')
+    monitor = FlakyMonitor(failing={'Lima'})
+
+    first = run_batch(monitor, ['Oslo', 'Lima', 'Oslo', 'Kyiv'], output, concurrency=2)
+
+    assert first == dict(first, total=3, skipped=0, checked=2, failed=1, alerts=2)
+    assert {entry['destination']: entry['status'] for entry in read_entries(output)} == {
+        'Oslo': 'ok', 'Lima': 'error', 'Kyiv': 'ok'
+    }
+    assert read_completed(output) == {'Oslo', 'Kyiv'}
+
+    monitor.checked.clear()
+    second = run_batch(monitor, ['Oslo', 'Lima', 'Kyiv'], output, concurrency=2)
+
+    assert monitor.checked == ['Lima']
+    assert second == dict(second, total=3, skipped=2, checked=1, failed=0)
+    assert read_completed(output) == {'Oslo', 'Lima', 'Kyiv'}
+
+
+def test_results_are_written_as_they_complete(tmp_path):
+    output = tmp_path / 'alerts.jsonl'
+
+    class WatchingMonitor(FlakyMonitor):
+        def fetch_safety_alerts(self, destination, **kwargs):
+            if destination == 'Kyiv':
+                # The first destination is already on disk while the second runs
+                assert [entry['destination'] for entry in read_entries(output)] == ['Oslo']
+            return super().fetch_safety_alerts(destination, **kwargs)
+
+    run_batch(WatchingMonitor(), ['Oslo', 'Kyiv'], str(output), concurrency=1)
+
+    assert len(read_entries(output)) == 2
+
+
+def test_partial_trailing_line_is_ignored(tmp_path):
+    output = tmp_path / 'alerts.jsonl'
+    output.write_text('{"destination": "Oslo", "status": "ok", "alerts": []}\n{"destination": "Li')
+
+    assert read_completed(str(output)) == {'Oslo'}
+
+
+def test_destination_whose_searches_all_fail_is_an_error(tmp_path):
+    monitor = SafetyMonitor.__new__(SafetyMonitor)
+    monitor.app = FailingScraper()
+    monitor.limiter = TokenBucket(1000, 1000)
+    output = str(tmp_path / 'alerts.jsonl')
+
+    assert monitor.fetch_safety_alerts('Lima', min_alerts=1) == []
+    summary = run_batch(monitor, ['Lima'], output)
+
+    assert summary['failed'] == 1
+    assert read_entries(output)[0]['status'] == 'error'
+    assert read_completed(output) == set()
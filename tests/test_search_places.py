@@ -0,0 +1,74 @@
+import collections
+import threading
+
+from app.services.replay import FakeMapsClient
+
+
+class CountingMaps(FakeMapsClient):
+    """Fake whose first five results are shared between every type"""
+
+    def __init__(self, failing_types=()):
+        super().__init__()
+        self.calls = collections.Counter()
+        self.failing_types = set(failing_types)
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self.calls[name] += 1
+
+    def geocode(self, address, **kwargs):
+        self._count('geocode')
+        return super().geocode(address, **kwargs)
+
+    def places_nearby(self, location=None, radius=None, type=None, **kwargs):
+        self._count('places_nearby')
+        if type in self.failing_types:
+            raise RuntimeError('INVALID_REQUEST')
+        response = super().places_nearby(location, radius, type, **kwargs)
+        for i, result in enumerate(response['results'][:5]):
+            result['place_id'] = f"shared-{i}"
+        return response
+
+    def place(self, place_id=None, **kwargs):
+        self._count('place')
+        return super().place(place_id, **kwargs)
+
+
+def test_multi_type_search_geocodes_once_and_enriches_each_place_once(make_app):
+    maps = CountingMaps()
+    client = make_app(maps=maps).test_client()
+
+    body = client.get('/api/search_places?location=Oslo&type=museum,park&type=restaurant&type=park').json
+
+    assert body['types'] == ['museum', 'park', 'restaurant']
+    assert {t: len(places) for t, places in body['places_by_type'].items()} == {
+        'museum': 20, 'park': 20, 'restaurant': 20
+    }
+    # 3 x 20 results, 5 of them shared by every type
+    assert body['count'] == 50
+    assert maps.calls == {'geocode': 1, 'places_nearby': 3, 'place': 50}
+
+
+def test_single_type_keeps_flat_response(make_app):
+    client = make_app(maps=CountingMaps()).test_client()
+
+    body = client.get('/api/search_places?location=Oslo&type=museum').json
+
+    assert set(body) == {'places', 'count'}
+    assert body['count'] == 20
+
+
+def test_failing_type_does_not_empty_the_others(make_app):
+    client = make_app(maps=CountingMaps(failing_types={'casino'})).test_client()
+
+    body = client.get('/api/search_places?location=Oslo&type=museum,casino').json
+
+    assert len(body['places_by_type']['museum']) == 20
+    assert body['places_by_type']['casino'] == []
+
+
+def test_too_many_types_is_rejected(client):
+    response = client.get('/api/search_places?location=Oslo&type=a,b,c,d,e,f,g,h,i')
+
+    assert response.status_code == 400
@@ -0,0 +1,135 @@
+import time
+
+import pytest
+
+from app.services.shared_cache import (
+    CachedClient, InMemoryRedis, RedisCache, SQLiteCache, create_cache_backend, pack, unpack
+)
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteCache(str(tmp_path / 'shared.sqlite3'), max_entries=50, max_value_bytes=256)
+    return RedisCache(InMemoryRedis(), max_value_bytes=256)
+
+
+def test_pack_round_trip():
+    value = {'results': [{'lat': 1.5, 'name': 'x', 'open': True, 'rating': None}]}
+
+    assert unpack(pack(value)) == value
+
+
+def test_get_set_delete(backend):
+    backend.set('k', {'a': [1, 2]})
+
+    assert backend.get('k') == {'a': [1, 2]}
+    backend.delete('k')
+    assert backend.get('k', 'missing') == 'missing'
+
+
+def test_entries_expire_after_ttl(backend):
+    backend.set('short', 1, ttl=1)
+    backend.set('long', 2, ttl=60)
+    time.sleep(1.1)
+
+    assert backend.get('short') is None
+    assert backend.get('long') == 2
+
+
+def test_oversized_values_are_skipped(backend):
+    backend.set('big', 'x' * 1000)
+
+    assert backend.get('big') is None
+    assert backend.stats()['oversized'] == 1
+
+
+def test_clear_only_removes_own_prefix():
+    redis = InMemoryRedis()
+    redis.set('other:key', b'1')
+    cache = RedisCache(redis, prefix='app:')
+    cache.set('k', 1)
+    cache.clear()
+
+    assert cache.get('k') is None
+    assert redis.get('other:key') == b'1'
+
+
+def test_sqlite_evicts_oldest_beyond_max_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'shared.sqlite3'), max_entries=50)
+    for i in range(SQLiteCache.EVICT_EVERY):
+        cache.set(f"k{i}", i, ttl=60)
+
+    assert len(cache) == 50
+    assert cache.get('k0') is None
+    assert cache.get(f"k{SQLiteCache.EVICT_EVERY - 1}") == SQLiteCache.EVICT_EVERY - 1
+
+
+def test_sqlite_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    SQLiteCache(path).set('k', {'v': 1}, ttl=60)
+
+    assert SQLiteCache(path).get('k') == {'v': 1}
+
+
+def test_unreachable_redis_counts_errors_as_misses():
+    cache = RedisCache.from_url('redis://127.0.0.1:1/0')
+    cache.set('k', 1)
+
+    assert cache.get('k', 'default') == 'default'
+    assert cache.stats()['errors'] == 2
+
+
+def test_create_cache_backend_uses_in_memory_redis():
+    cache = create_cache_backend({'CACHE_BACKEND': 'redis', 'CACHE_REDIS_URL': 'memory://'})
+
+    assert isinstance(cache, RedisCache)
+    assert isinstance(cache.client, InMemoryRedis)
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, prompt):
+        self.calls += 1
+        return {'text': prompt.upper(), 'latency_ms': 5000.0}
+
+    def other(self):
+        return 'passthrough'
+
+
+def test_cached_client_marks_hits_and_reports_lookup_latency():
+    upstream = FakeClient()
+    client = CachedClient(upstream, 'llm', RedisCache(InMemoryRedis()), {'complete': 60})
+
+    first = client.complete('rome')
+    second = client.complete('rome')
+
+    assert upstream.calls == 1
+    assert 'cached' not in first
+    assert second['cached'] is True
+    assert second['text'] == 'ROME'
+    assert second['latency_ms'] < 5000
+    assert client.other() == 'passthrough'
+
+
+def test_cached_hit_does_not_mutate_the_stored_value():
+    stored = {}
+
+    class SharedObjects:
+        """Hands out the stored objects themselves, like the memory backend"""
+
+        def set(self, key, value, ttl=None):
+            stored[key] = value
+
+        def get(self, key, default=None):
+            return stored.get(key, default)
+
+    client = CachedClient(FakeClient(), 'llm', SharedObjects(), {'complete': 60})
+    client.complete('rome')
+
+    hit = client.complete('rome')
+
+    assert hit['cached'] is True
+    assert list(stored.values()) == [{'text': 'ROME', 'latency_ms': 5000.0}]